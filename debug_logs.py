@@ -1,8 +1,16 @@
 """Debug script to check Cloud Run logging configuration."""
 import os
 import argparse
+import itertools
+import re
 from datetime import datetime, timedelta
-from google.cloud.logging import Client
+from google.cloud.logging import Client, DESCENDING
+
+
+def take(iterator, n):
+    """Return at most n items from iterator without draining further pages."""
+    return list(itertools.islice(iterator, n))
+
 
 # Parse command line arguments
 parser = argparse.ArgumentParser(description='Debug Cloud Run logging configuration')
@@ -18,12 +26,15 @@ if not project_id:
     exit(1)
 
 print(f"Project ID: {project_id}")
-client = Client(project=project_id)
+# The gRPC transport ignores page_size and streams until the server stops; the
+# HTTP transport honors it, so each test below costs a single round trip
+client = Client(project=project_id, _use_grpc=False)
 
 service_name = args.service
 
-# Calculate time range
-end_time = datetime.utcnow()
+# Calculate time range, aligned to whole seconds so the filter bounds match
+# the RFC 3339 timestamps Cloud Logging indexes on
+end_time = datetime.utcnow().replace(microsecond=0)
 if args.days:
     start_time = end_time - timedelta(days=args.days)
     lookback_str = f"{args.days} day(s)"
@@ -31,17 +42,40 @@ else:
     start_time = end_time - timedelta(hours=args.hours)
     lookback_str = f"{args.hours} hour(s)"
 
-time_filter = f' AND timestamp >= "{start_time.isoformat()}Z" AND timestamp <= "{end_time.isoformat()}Z"'
+start_str = start_time.strftime("%Y-%m-%dT%H:%M:%SZ")
+end_str = end_time.strftime("%Y-%m-%dT%H:%M:%SZ")
+time_filter = f' AND timestamp >= "{start_str}" AND timestamp <= "{end_str}"'
 print(f"Service: {service_name}")
 print(f"Time range: Last {lookback_str}")
-print(f"  Start: {start_time.isoformat()}Z")
-print(f"  End:   {end_time.isoformat()}Z")
+print(f"  Start: {start_str}")
+print(f"  End:   {end_str}")
+
+# Cloud Run writes its logs under run.googleapis.com/* log names; restricting on
+# logName lets the backend skip log buckets that can't contain Cloud Run entries
+log_name_filter = f' AND logName:"projects/{project_id}/logs/run.googleapis.com"'
+
+# Tests 1 and 4 query the same resource type and time range, so fetch the
+# newest Cloud Run entries once and derive both outputs from that result set.
+# Iteration stops early once the service-name set has stopped growing.
+cloud_run_filter = f'resource.type = "cloud_run_revision"{log_name_filter}{time_filter}'
+cloud_run_entries = []
+service_names = set()
+stable = 0
+for entry in itertools.islice(client.list_entries(filter_=cloud_run_filter, order_by=DESCENDING, page_size=100), 500):
+    cloud_run_entries.append(entry)
+    before = len(service_names)
+    if 'service_name' in entry.resource.labels:
+        service_names.add(entry.resource.labels['service_name'])
+    if 'configuration_name' in entry.resource.labels:
+        service_names.add(entry.resource.labels['configuration_name'])
+    stable = stable + 1 if len(service_names) == before else 0
+    if stable >= 50 and service_names:
+        break
 
 # Test 1: Check if any Cloud Run logs exist (with time filter)
 print("\n=== Test 1: Any Cloud Run logs (with time range) ===")
-filter1 = f'resource.type = "cloud_run_revision"{time_filter}'
-print(f"Filter: {filter1}")
-entries1 = list(client.list_entries(filter_=filter1, page_size=5))
+print(f"Filter: {cloud_run_filter}")
+entries1 = cloud_run_entries[:5]
 print(f"Found {len(entries1)} Cloud Run log entries")
 if entries1:
     print("\nFirst entry resource labels:")
@@ -52,7 +86,7 @@ if entries1:
 print(f"\n=== Test 2: Current filter for {service_name} with severity ===")
 filter2 = f'resource.type = "cloud_run_revision" AND resource.labels.service_name = "{service_name}" AND severity >= DEFAULT{time_filter}'
 print(f"Filter: {filter2}")
-entries2 = list(client.list_entries(filter_=filter2, page_size=5))
+entries2 = take(client.list_entries(filter_=filter2, page_size=5, max_results=5), 5)
 print(f"Found {len(entries2)} log entries")
 if entries2:
     print(f"Latest log timestamp: {entries2[0].timestamp}")
@@ -61,33 +95,32 @@ if entries2:
 print(f"\n=== Test 3: Try configuration_name label with severity ===")
 filter3 = f'resource.type = "cloud_run_revision" AND resource.labels.configuration_name = "{service_name}" AND severity >= DEFAULT{time_filter}'
 print(f"Filter: {filter3}")
-entries3 = list(client.list_entries(filter_=filter3, page_size=5))
+entries3 = take(client.list_entries(filter_=filter3, page_size=5, max_results=5), 5)
 print(f"Found {len(entries3)} log entries")
 if entries3:
     print(f"Latest log timestamp: {entries3[0].timestamp}")
 
 # Test 4: List all unique service names from Cloud Run logs (with time filter)
 print("\n=== Test 4: Available Cloud Run services (in time range) ===")
-filter4 = f'resource.type = "cloud_run_revision"{time_filter}'
-entries4 = list(client.list_entries(filter_=filter4, page_size=100))
-service_names = set()
-for entry in entries4:
-    if 'service_name' in entry.resource.labels:
-        service_names.add(entry.resource.labels['service_name'])
-    if 'configuration_name' in entry.resource.labels:
-        service_names.add(entry.resource.labels['configuration_name'])
-
+print(f"Scanned {len(cloud_run_entries)} entries")
 print(f"Found services: {sorted(service_names)}")
 
 # Test 5: Search by partial match (with time filter)
+# The ':' operator does the substring match server-side; the compiled regex re-checks
+# the returned labels so only genuine matches are reported
 print(f"\n=== Test 5: Partial match search for 'vllm' or 'gemma' ===")
-filter5 = f'resource.type = "cloud_run_revision"{time_filter}'
-entries5 = list(client.list_entries(filter_=filter5, page_size=100))
+partial_match = (
+    'resource.labels.service_name:"vllm" OR resource.labels.service_name:"gemma"'
+    ' OR resource.labels.configuration_name:"vllm" OR resource.labels.configuration_name:"gemma"'
+)
+filter5 = f'resource.type = "cloud_run_revision" AND ({partial_match}){log_name_filter}{time_filter}'
+print(f"Filter: {filter5}")
+entries5 = take(client.list_entries(filter_=filter5, order_by=DESCENDING, page_size=100, max_results=100), 100)
+PARTIAL_MATCH_PATTERN = re.compile(r'vllm|gemma', re.IGNORECASE)
 matches = []
 for entry in entries5:
-    labels = entry.resource.labels
-    for key, value in labels.items():
-        if 'vllm' in value.lower() or 'gemma' in value.lower():
+    for key, value in entry.resource.labels.items():
+        if PARTIAL_MATCH_PATTERN.search(value):
             matches.append({key: value})
             break
 
@@ -26,8 +26,12 @@ from src.clients.github_mcp_client import GitHubMCPClient, create_github_mcp_cli
 load_dotenv()
 
 
-def example_basic_usage():
-    """Example: Basic client initialization and usage."""
+def connect_client():
+    """Example: Basic client initialization.
+
+    The client is created once here and shared by the examples below, so the
+    MCP handshake is only performed a single time per run.
+    """
     print("=" * 60)
     print("Example 1: Basic Client Usage")
     print("=" * 60)
@@ -43,27 +47,23 @@ def example_basic_usage():
     try:
         client = create_github_mcp_client(server_url=server_url)
         print("✓ Client initialized successfully")
-
-        # Close the client
-        client.close()
-        print("✓ Client closed")
+        return client
 
     except Exception as e:
         print(f"✗ Error: {e}")
         print("\nNote: The remote MCP server may not be publicly accessible.")
         print("This is expected if the server requires special authentication")
         print("or is only available to GitHub Copilot.")
+        return None
 
 
-def example_list_tools():
+def example_list_tools(client: GitHubMCPClient):
     """Example: List available tools from the MCP server."""
     print("\n" + "=" * 60)
     print("Example 2: List Available Tools")
     print("=" * 60)
 
     try:
-        client = create_github_mcp_client()
-
         print("\nFetching available tools from MCP server...")
         tools = client.list_tools()
 
@@ -74,45 +74,42 @@ def example_list_tools():
             print(f"    {tool.description}")
             print()
 
-        client.close()
-
     except Exception as e:
         print(f"✗ Error: {e}")
         print("\nNote: This may fail if the server is not accessible.")
 
 
-def example_with_context_manager():
-    """Example: Using the client with context manager."""
+def example_list_issues(client: GitHubMCPClient):
+    """Example: List issues in a repository."""
     print("\n" + "=" * 60)
-    print("Example 3: Using Context Manager")
+    print("Example 3: List Issues")
     print("=" * 60)
 
     try:
-        print("\nInitializing client with context manager...")
-
-        with GitHubMCPClient() as client:
-            print("✓ Client initialized")
-
-            # Example: List issues in a repository
-            owner = "octocat"
-            repo = "Hello-World"
-
-            print(f"\nListing issues in {owner}/{repo}...")
-            issues = client.list_issues(owner=owner, repo=repo, state="open")
+        owner = "octocat"
+        repo = "Hello-World"
 
-            print(f"✓ Found {len(issues)} open issues")
+        print(f"\nListing issues in {owner}/{repo}...")
+        issues = client.list_issues(owner=owner, repo=repo, state="open")
 
-            if issues:
-                print("\nFirst issue:")
-                print(json.dumps(issues[0], indent=2))
+        print(f"✓ Found {len(issues)} open issues")
 
-        print("\n✓ Client closed automatically")
+        if issues:
+            print("\nFirst issue:")
+            print(json.dumps(issues[0], indent=2))
 
     except Exception as e:
         print(f"✗ Error: {e}")
         print("\nNote: This may fail if the server is not accessible")
         print("or if you don't have access to the repository.")
 
+    print("\nFor one-off scripts the client can also be used as a context manager,")
+    print("which initializes on entry and closes the session on exit:")
+    print('''
+    with GitHubMCPClient() as client:
+        issues = client.list_issues(owner="octocat", repo="Hello-World")
+    ''')
+
 
 def example_create_issue():
     """Example: Create a GitHub issue."""
@@ -202,12 +199,19 @@ def main():
         print("  export GITHUB_TOKEN='your_github_personal_access_token'")
         print()
 
-    # Run examples
-    example_basic_usage()
-    # example_list_tools()  # Uncomment to test
-    # example_with_context_manager()  # Uncomment to test
-    example_create_issue()
-    example_langchain_tools()
+    # Run examples, sharing a single client across those that need a connection
+    client = connect_client()
+    try:
+        # Uncomment to test against a live server
+        # if client:
+        #     example_list_tools(client)
+        #     example_list_issues(client)
+        example_create_issue()
+        example_langchain_tools()
+    finally:
+        if client:
+            client.close()
+            print("\n✓ Client closed")
 
     print("\n" + "=" * 60)
     print("Examples completed")
@@ -12,19 +12,66 @@ import requests
 from google.auth import default
 from google.auth.transport.requests import Request
 from google.oauth2 import id_token
+import base64
+import hashlib
 import json
+import os
+import random
 import sys
 import time
 
+# Retry budget for requests rejected by the endpoint's rate limiter (HTTP 429)
+RATE_LIMIT_MAX_ATTEMPTS = 4
+
+# Cached tokens are reused only while they have at least this many seconds left
+TOKEN_MIN_REMAINING_SECONDS = 300
+
+
+def _token_cache_path(target_audience: str) -> str:
+    """Return the on-disk cache path for the identity token of an audience."""
+    digest = hashlib.sha256(target_audience.encode()).hexdigest()[:16]
+    return os.path.join(os.path.expanduser("~"), ".cache", f"a2a_token_{digest}.json")
+
+
+def _load_cached_token(target_audience: str):
+    """Return a cached identity token if it is still valid, otherwise None."""
+    try:
+        with open(_token_cache_path(target_audience)) as f:
+            cached = json.load(f)
+        if cached["exp"] - time.time() > TOKEN_MIN_REMAINING_SECONDS:
+            return cached["token"]
+    except (OSError, ValueError, KeyError):
+        pass
+    return None
+
+
+def _save_cached_token(target_audience: str, token: str):
+    """Persist an identity token together with its JWT expiry claim."""
+    try:
+        payload = token.split('.')[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+        cache_path = _token_cache_path(target_audience)
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(cache_path, "w") as f:
+            json.dump({"token": token, "exp": claims["exp"]}, f)
+        os.chmod(cache_path, 0o600)
+    except (OSError, ValueError, KeyError, IndexError) as e:
+        print(f"Warning: could not cache identity token: {e}")
+
 
 def get_identity_token(target_audience: str) -> str:
     """Get Google Cloud identity token for the current service account."""
+    cached_token = _load_cached_token(target_audience)
+    if cached_token:
+        return cached_token
+
     try:
         credentials, project = default()
         auth_req = Request()
 
         # Get ID token for the target audience
         token = id_token.fetch_id_token(auth_req, target_audience)
+        _save_cached_token(target_audience, token)
         return token
     except Exception as e:
         print(f"Error getting identity token: {e}")
@@ -33,11 +80,23 @@ def get_identity_token(target_audience: str) -> str:
         sys.exit(1)
 
 
-def test_health_endpoint(service_url: str) -> bool:
+def post_with_backoff(session: requests.Session, url: str, **kwargs) -> requests.Response:
+    """POST to url, retrying 429 responses with jittered exponential backoff."""
+    for attempt in range(RATE_LIMIT_MAX_ATTEMPTS):
+        response = session.post(url, **kwargs)
+        if response.status_code != 429 or attempt == RATE_LIMIT_MAX_ATTEMPTS - 1:
+            return response
+        delay = (2 ** attempt) + random.random()
+        print(f"    Rate limited (429), retrying in {delay:.1f}s...")
+        time.sleep(delay)
+    return response
+
+
+def test_health_endpoint(session: requests.Session, service_url: str) -> bool:
     """Test the health check endpoint."""
     print("\n[1] Testing /health endpoint...")
     try:
-        response = requests.get(f"{service_url}/health", timeout=10)
+        response = session.get(f"{service_url}/health", timeout=10)
         response.raise_for_status()
 
         data = response.json()
@@ -50,11 +109,11 @@ def test_health_endpoint(service_url: str) -> bool:
         return False
 
 
-def test_agent_metadata(service_url: str) -> bool:
+def test_agent_metadata(session: requests.Session, service_url: str) -> bool:
     """Test the agent metadata endpoint."""
     print("\n[2] Testing /.well-known/agent.json endpoint...")
     try:
-        response = requests.get(f"{service_url}/.well-known/agent.json", timeout=10)
+        response = session.get(f"{service_url}/.well-known/agent.json", timeout=10)
         response.raise_for_status()
 
         data = response.json()
@@ -68,7 +127,7 @@ def test_agent_metadata(service_url: str) -> bool:
         return False
 
 
-def test_a2a_endpoint(service_url: str, token: str) -> bool:
+def test_a2a_endpoint(session: requests.Session, service_url: str, token: str) -> bool:
     """Test the A2A /execute endpoint with authentication."""
     print("\n[3] Testing /a2a/execute endpoint with authentication...")
 
@@ -88,7 +147,8 @@ def test_a2a_endpoint(service_url: str, token: str) -> bool:
         print(f"    Service: test-service (cloud_run)")
 
         start_time = time.time()
-        response = requests.post(
+        response = post_with_backoff(
+            session,
             f"{service_url}/a2a/execute",
             headers={
                 "Authorization": f"Bearer {token}",
@@ -135,7 +195,7 @@ def test_a2a_endpoint(service_url: str, token: str) -> bool:
         return False
 
 
-def test_unauthorized_access(service_url: str) -> bool:
+def test_unauthorized_access(session: requests.Session, service_url: str) -> bool:
     """Test that unauthorized requests are rejected."""
     print("\n[4] Testing unauthorized access rejection...")
 
@@ -146,7 +206,8 @@ def test_unauthorized_access(service_url: str) -> bool:
 
     try:
         # Request without token
-        response = requests.post(
+        response = post_with_backoff(
+            session,
             f"{service_url}/a2a/execute",
             headers={"Content-Type": "application/json"},
             json=payload,
@@ -175,25 +236,31 @@ def main():
     service_url = "https://agentic-log-attacker-665374072631.us-central1.run.app"
     print(f"\nTarget service: {service_url}")
 
+    # All tests hit the same host, so share one keep-alive connection pool
+    session = requests.Session()
+    session.mount("https://", requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=4))
+
     # Test 1: Health check (no auth required)
-    health_ok = test_health_endpoint(service_url)
+    health_ok = test_health_endpoint(session, service_url)
 
     # Test 2: Agent metadata (no auth required)
-    metadata_ok = test_agent_metadata(service_url)
+    metadata_ok = test_agent_metadata(session, service_url)
 
     # Test 3: Unauthorized access rejection
-    unauth_ok = test_unauthorized_access(service_url)
+    unauth_ok = test_unauthorized_access(session, service_url)
 
     # Test 4: A2A endpoint with authentication
     print("\n[Getting authentication token...]")
     try:
         token = get_identity_token(service_url)
         print("    ✓ Successfully obtained identity token")
-        a2a_ok = test_a2a_endpoint(service_url, token)
+        a2a_ok = test_a2a_endpoint(session, service_url, token)
     except Exception as e:
         print(f"    ✗ Failed to get token: {e}")
         a2a_ok = False
 
+    session.close()
+
     # Summary
     print("\n" + "=" * 50)
     print("Test Summary")
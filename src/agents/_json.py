@@ -0,0 +1,26 @@
+import re
+import json
+import orjson
+
+_JSON_START = re.compile(r"[\[{]")
+_DECODER = json.JSONDecoder()
+
+def _parse_json_block(text: str):
+    """Parses the first JSON array or object in an LLM response.
+
+    Markdown fences and surrounding prose are skipped: decoding starts at the first
+    "[" or "{" (after a ```json fence, if there is one) and stops where the value ends.
+    The span up to the last matching bracket is tried with orjson first; the stdlib
+    raw_decode handles responses with more than one value.
+    Raises json.JSONDecodeError if no JSON value is found.
+    """
+    fence = text.find("```json")
+    match = _JSON_START.search(text, fence if fence >= 0 else 0)
+    if match is None:
+        raise json.JSONDecodeError("No JSON array or object found", text, 0)
+    start = match.start()
+    end = text.rfind("]" if text[start] == "[" else "}")
+    try:
+        return orjson.loads(text[start:end + 1])
+    except orjson.JSONDecodeError:
+        return _DECODER.raw_decode(text, start)[0]
@@ -0,0 +1,109 @@
+import os
+import json
+import time
+import hashlib
+import functools
+import tempfile
+
+from src.config import CONFIG
+
+# On-disk cache of Gemini responses, keyed by a hash of the model name and prompt
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "agentic-log-attacker", "llm")
+
+@functools.lru_cache(maxsize=1)
+def _configure():
+    """Configures the Gemini client with the API key, once, just before the first model is built."""
+    import google.generativeai as genai
+    if CONFIG.gemini_api_key:
+        genai.configure(api_key=CONFIG.gemini_api_key)
+    return genai
+
+@functools.lru_cache(maxsize=8)
+def _shared_model(model_name: str, system_instruction):
+    """Builds the GenerativeModel for a model name and system instruction."""
+    return _configure().GenerativeModel(model_name, system_instruction=system_instruction)
+
+def _model(model_name: str, system_instruction: str = None):
+    """Returns the Gemini model for model_name, created once per process and reused afterwards.
+
+    A model built with a system_instruction sends it ahead of every prompt, as a fixed prefix.
+    """
+    # Always pass both arguments positionally: lru_cache keys _model("m") and
+    # _model("m", None) differently, which would build a second client for the same model
+    return _shared_model(model_name, system_instruction)
+
+_model.cache_clear = _shared_model.cache_clear
+
+def _cache_path(model_name: str, prompt: str, system_instruction: str = None) -> str:
+    """Returns the cache file path for a model/prompt pair (and system instruction, if any)."""
+    key_text = model_name + "\0" + prompt if system_instruction is None else "\0".join((model_name, system_instruction, prompt))
+    key = hashlib.sha256(key_text.encode()).hexdigest()
+    return os.path.join(CACHE_DIR, f"{key}.json")
+
+def load_cached(model_name: str, prompt: str, system_instruction: str = None, max_age: float = None):
+    """Returns the cached response text for a model/prompt pair, or None on a miss.
+
+    Entries written more than max_age seconds ago count as a miss.
+    """
+    try:
+        with open(_cache_path(model_name, prompt, system_instruction), "r") as f:
+            if max_age is not None and time.time() - os.fstat(f.fileno()).st_mtime > max_age:
+                return None
+            return json.load(f)["text"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+def store_cached(model_name: str, prompt: str, text: str, system_instruction: str = None):
+    """Atomically writes a response to the cache. Failures are logged and ignored."""
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump({"model": model_name, "text": text}, f)
+            os.replace(tmp_path, _cache_path(model_name, prompt, system_instruction))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError as e:
+        print(f"Warning: could not write LLM cache entry: {e}")
+
+def cached_generate(model_name: str, prompt: str, skip_cache: bool = False, system_instruction: str = None, max_age: float = None,
+                    generation_config: dict = None) -> str:
+    """Returns Gemini's response text for prompt, reusing a cached response when one exists.
+
+    Pass skip_cache=True to always call the model; the fresh response still refreshes the cache.
+    Cached responses older than max_age seconds are ignored and refreshed. generation_config is
+    not part of the cache key, so a caller should always pass the same config for a given prompt.
+    """
+    if not skip_cache:
+        text = load_cached(model_name, prompt, system_instruction, max_age)
+        if text is not None:
+            return text
+
+    model = _model(model_name, system_instruction)
+    if generation_config is None:
+        text = model.generate_content(prompt).text
+    else:
+        text = model.generate_content(prompt, generation_config=generation_config).text
+    if text:
+        store_cached(model_name, prompt, text, system_instruction)
+    return text
+
+def stream_generate(model_name: str, prompt: str, on_chunk=None) -> str:
+    """Streams Gemini's response for prompt and returns the full text.
+
+    Each text chunk is passed to on_chunk as soon as it arrives, so callers can show
+    partial output before the response is complete.
+    """
+    parts = []
+    for chunk in _model(model_name).generate_content(prompt, stream=True):
+        try:
+            text = chunk.text
+        except ValueError:
+            # Chunks without text parts, e.g. the final chunk of a safety-blocked response
+            continue
+        parts.append(text)
+        if on_chunk is not None:
+            on_chunk(text)
+    return "".join(parts)
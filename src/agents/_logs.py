@@ -0,0 +1,57 @@
+import re
+
+# Lines worth keeping when logs are too long to send verbatim
+_SEVERITY = re.compile(r"(?i)\b(error|warn|warning|exception|traceback|fatal|critical|timeout|fail|failed|failure)\b")
+# Gate for calling the model at all. Unanchored, so exception class names and plurals
+# (NullPointerException, ValueError, "3 errors") count too
+_PROBLEM = re.compile(r"(?i)error|warn|exception|traceback|fatal|critical|timeout|fail")
+_DIGITS = re.compile(r"\d+")
+_QUERY_WORD = re.compile(r"[A-Za-z_][A-Za-z_0-9]{3,}")
+
+# Logs up to this many lines are sent unchanged
+COMPRESS_MIN_LINES = 200
+# Lines kept around each matching line, and the cap on lines returned
+CONTEXT_LINES = 2
+MAX_COMPRESSED_LINES = 300
+
+def _line_count(text: str) -> int:
+    """Returns the number of lines in text without splitting it into a list."""
+    if not text:
+        return 0
+    return text.count("\n") + (not text.endswith("\n"))
+
+def _has_problem_lines(logs: str) -> bool:
+    """Returns True if any line in logs looks like an error, warning or failure."""
+    return _PROBLEM.search(logs) is not None
+
+def _compress_logs(logs: str, query: str = None) -> str:
+    """Shrinks a long log dump to the lines most likely to matter for the prompt.
+
+    Keeps lines mentioning an error, warning, exception or timeout (or a word from
+    query) plus CONTEXT_LINES lines around each. If nothing matches, every line is a
+    candidate instead. Lines that repeat an earlier line apart from numbers
+    (timestamps, ids) are folded into their first occurrence, which is prefixed with
+    the repeat count (e.g. "[x40] ..."), and the result is capped at
+    MAX_COMPRESSED_LINES distinct lines.
+    """
+    if _line_count(logs) <= COMPRESS_MIN_LINES:
+        return logs
+
+    lines = logs.splitlines()
+
+    query_words = {word.lower() for word in _QUERY_WORD.findall(query or "")}
+    keep = set()
+    for i, line in enumerate(lines):
+        if _SEVERITY.search(line) or (query_words and any(word in line.lower() for word in query_words)):
+            keep.update(range(max(0, i - CONTEXT_LINES), min(len(lines), i + CONTEXT_LINES + 1)))
+
+    # Insertion-ordered, so exemplars stay in log order; values are [exemplar, count]
+    exemplars = {}
+    for i in sorted(keep) if keep else range(len(lines)):
+        key = _DIGITS.sub("#", lines[i])
+        entry = exemplars.get(key)
+        if entry is not None:
+            entry[1] += 1
+        elif len(exemplars) < MAX_COMPRESSED_LINES:
+            exemplars[key] = [lines[i], 1]
+    return "\n".join([line if count == 1 else f"[x{count}] {line}" for line, count in exemplars.values()])
@@ -0,0 +1,99 @@
+import math
+import time
+import logging
+import threading
+from collections import OrderedDict
+
+from src.config import CONFIG
+
+logger = logging.getLogger(__name__)
+
+def _embed(text: str) -> list[float]:
+    """Returns the unit-length Gemini embedding of text."""
+    from src.agents._llm_cache import _configure
+    vector = _configure().embed_content(model=CONFIG.embedding_model, content=text, task_type="SEMANTIC_SIMILARITY")["embedding"]
+    norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+    return [x / norm for x in vector]
+
+class SemanticCache:
+    """Reuses answers for queries that mean the same thing as a recent one.
+
+    Entries are grouped by a namespace (e.g. the service a question is about) and matched by
+    cosine similarity of query embeddings. At most maxsize entries are kept, least recently
+    used first out, and entries older than ttl seconds are ignored. Embedding failures count
+    as misses, so the cache never stops an agent from answering.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 300.0, threshold: float = 0.92, embed=_embed):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.threshold = threshold
+        self._embed = embed
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._next_key = 0
+
+    def _has_live_entry(self, namespace, now: float) -> bool:
+        """Returns whether namespace has an unexpired entry. Call with the lock held."""
+        return any(expires > now and entry_namespace == namespace for expires, entry_namespace, _, _ in self._entries.values())
+
+    def _try_embed(self, text: str):
+        """Returns the embedding of text, or None if the embedding call fails."""
+        try:
+            return self._embed(text)
+        except Exception as e:
+            logger.warning("Could not embed query for the semantic cache: %s", e)
+            return None
+
+    def lookup(self, namespace, query: str):
+        """Returns (value, embedding): the cached value for a similar query, or None, and the query's embedding.
+
+        The query is only embedded when namespace has a live entry to compare against; otherwise
+        (None, None) is returned without calling the embedding model. Pass the embedding on to
+        store() after a miss so the query is embedded at most once.
+        """
+        with self._lock:
+            if not self._has_live_entry(namespace, time.monotonic()):
+                return None, None
+
+        embedding = self._try_embed(query)
+        if embedding is None:
+            return None, None
+
+        now = time.monotonic()
+        best_key, best_score = None, self.threshold
+        with self._lock:
+            for key, (expires, entry_namespace, entry_embedding, _) in self._entries.items():
+                if expires <= now or entry_namespace != namespace:
+                    continue
+                score = sum(a * b for a, b in zip(embedding, entry_embedding))
+                if score >= best_score:
+                    best_key, best_score = key, score
+            if best_key is None:
+                return None, embedding
+            self._entries.move_to_end(best_key)
+            return self._entries[best_key][3], embedding
+
+    def store(self, namespace, query: str, value, embedding=None):
+        """Caches value for query, reusing the embedding returned by lookup() when there is one.
+
+        The query is only embedded here when lookup() didn't need to; if that fails, nothing is stored.
+        """
+        if embedding is None:
+            embedding = self._try_embed(query)
+            if embedding is None:
+                return
+        with self._lock:
+            self._entries[self._next_key] = (time.monotonic() + self.ttl, namespace, embedding, value)
+            self._next_key += 1
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drops every entry."""
+        with self._lock:
+            self._entries.clear()
+
+# Answers shared by the agents, grouped per agent and service. Logs move on, so entries
+# only live for a few minutes.
+answer_cache = SemanticCache()
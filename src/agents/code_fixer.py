@@ -1,23 +1,262 @@
 import os
 import json
+import hashlib
+import functools
 import re
+import shlex
 import subprocess
-import google.generativeai as genai
-from github import Github
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+import orjson
 from src.agents.issue_creation_agent import Issue
+from src.config import CONFIG
+from src.agents._llm_cache import _model, cached_generate, load_cached, store_cached
 
-def create_pull_request(branch_name: str, issue: Issue, repo_url: str):
+# Directories that never contain source worth sending to the model
+SKIP_DIRS = {".git", "node_modules", "__pycache__"}
+# Extensions (and extensionless file names) worth offering the model as fix candidates
+_CODE_EXTS = frozenset({
+    "py", "js", "ts", "go", "rs", "java", "c", "cc", "cpp", "h", "hpp", "rb", "php",
+    "cs", "kt", "swift", "sh", "md", "yaml", "yml", "toml", "json",
+})
+_CODE_NAMES = frozenset({"Dockerfile", "Makefile"})
+# Per-file byte cap and total token budget for code included in the fix prompt
+MAX_FILE_BYTES = 32_000
+CODE_TOKEN_BUDGET = 32_000
+# Rough characters-per-token ratio for source code with Gemini's tokenizer
+CHARS_PER_TOKEN = 4
+
+# Identifier-like tokens (file names, modules, symbols) mentioned in log entries
+_LOG_TOKEN = re.compile(r"[A-Za-z_][A-Za-z_0-9.]{3,}")
+# Bytes of each file searched for log tokens, and the cap on candidate files
+CONTENT_SCAN_BYTES = 2048
+MAX_CANDIDATE_FILES = 200
+# Directories with this many files are summarized by count only in the file-selection prompt
+MAX_LISTED_DIR_FILES = 20
+TREE_SUMMARY_MAX_CHARS = 16_000
+# Leading bytes checked for NUL to detect binary files
+BINARY_SNIFF_BYTES = 1024
+
+def _estimate_tokens(text: str) -> int:
+    """Estimates the token count of text locally, avoiding a count_tokens round trip per file."""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+def _extract_json_block(text: str):
+    """Returns the body of the first ```json fenced block in text, or None."""
+    start = text.find("```json")
+    if start < 0:
+        return None
+    start = text.find("\n", start)
+    if start < 0:
+        return None
+    end = text.find("\n```", start)
+    return text[start + 1:end] if end >= 0 else None
+
+def _is_code_path(path: str) -> bool:
+    """Returns True for source, config and doc files; images, lock files and the like are excluded."""
+    name = path.rpartition("/")[2]
+    return name in _CODE_NAMES or ("." in name and name.rpartition(".")[2] in _CODE_EXTS)
+
+def list_tracked_files(repo_path: str) -> list[str]:
+    """Returns the repository's tracked code files, relative to repo_path, excluding SKIP_DIRS."""
+    output = subprocess.run(["git", "ls-files", "-z"], check=True, cwd=repo_path, capture_output=True).stdout
+    return [
+        path for path in output.decode("utf-8", errors="replace").split("\0")
+        if path and _is_code_path(path) and not SKIP_DIRS.intersection(path.split("/"))
+    ]
+
+def _iter_blobs(repo_path: str, file_paths: list[str]):
+    """Yields (file_path, content_bytes) for tracked files using a single `git cat-file --batch` process."""
+    proc = subprocess.Popen(
+        ["git", "cat-file", "--batch"],
+        cwd=repo_path,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        for file_path in file_paths:
+            if "\n" in file_path:
+                continue
+            proc.stdin.write(f"HEAD:{file_path}\n".encode())
+            proc.stdin.flush()
+            header = proc.stdout.readline().split()
+            if len(header) != 3 or header[1] != b"blob":
+                # "<object> missing" or a non-blob entry such as a submodule
+                continue
+            content = proc.stdout.read(int(header[2]))
+            proc.stdout.read(1)  # trailing newline after each object
+            yield file_path, content
+    finally:
+        proc.stdin.close()
+        proc.kill()
+        proc.wait()
+
+def _log_tokens(log_entries: list[str]) -> set[str]:
+    """Returns the identifier-like tokens mentioned in the log entries."""
+    return set(_LOG_TOKEN.findall("\n".join(log_entries)))
+
+def select_candidate_files(repo_path: str, all_files: list[str], log_entries: list[str]) -> list[str]:
+    """Narrows the repository file list to files referenced by the issue's log entries.
+
+    Files whose name (or name without extension) appears in the logs are taken first,
+    then files whose first few KB mention any log token. Returns all_files unchanged
+    if nothing matches.
+    """
+    tokens = _log_tokens(log_entries)
+    if not tokens:
+        return all_files
+
+    candidates = [
+        path for path in all_files
+        if os.path.basename(path) in tokens or os.path.splitext(os.path.basename(path))[0] in tokens
+    ]
+
+    chosen = set(candidates)
+    remaining = [path for path in all_files if path not in chosen]
+    if len(candidates) < MAX_CANDIDATE_FILES and remaining:
+        byte_tokens = [token.encode() for token in tokens]
+        for path, content in _iter_blobs(repo_path, remaining):
+            if any(token in content[:CONTENT_SCAN_BYTES] for token in byte_tokens):
+                candidates.append(path)
+                if len(candidates) >= MAX_CANDIDATE_FILES:
+                    break
+
+    return candidates[:MAX_CANDIDATE_FILES] or all_files
+
+@functools.lru_cache(maxsize=32)
+def _summarize_tree(paths: tuple[str, ...], max_chars: int = TREE_SUMMARY_MAX_CHARS) -> str:
+    """Summarizes a file list as one line per directory, largest directories first.
+
+    Directories with fewer than MAX_LISTED_DIR_FILES files list their file names;
+    larger ones show only a count. The result is cut at a line boundary to max_chars.
+    """
+    groups = {}
+    for path in paths:
+        directory, _, name = path.rpartition("/")
+        groups.setdefault(directory + "/" if directory else "./", []).append(name)
+
+    lines = []
+    for directory, names in sorted(groups.items(), key=lambda item: len(item[1]), reverse=True):
+        if len(names) < MAX_LISTED_DIR_FILES:
+            lines.append(f"{directory} ({len(names)} files): {', '.join(names)}")
+        else:
+            lines.append(f"{directory} ({len(names)} files)")
+
+    summary = "\n".join(lines)
+    if len(summary) > max_chars:
+        cut = summary.rfind("\n", 0, max_chars)
+        summary = summary[:cut] if cut > 0 else summary[:max_chars]
+    return summary
+
+def _stream_json_block(prompt: str, skip_cache: bool = False):
+    """Streams a Gemini response and stops as soon as a complete ```json block has arrived.
+
+    A cached response for the same prompt is reused unless skip_cache is set, and a
+    streamed response is cached once its block is complete.
+    Returns a (json_text, response_text) tuple; json_text is None if no block was found.
+    """
+    if not skip_cache:
+        text = load_cached(CONFIG.gemini_model, prompt)
+        if text is not None:
+            return _extract_json_block(text), text
+
+    text = ""
+    for chunk in _model(CONFIG.gemini_model).generate_content(prompt, stream=True):
+        try:
+            chunk_text = chunk.text
+        except ValueError:
+            # Chunks without text parts, e.g. the final chunk of a safety-blocked response
+            continue
+        text += chunk_text
+        # Only re-scan when a fence may have just been completed
+        if "```" in text[-(len(chunk_text) + 3):]:
+            json_text = _extract_json_block(text)
+            if json_text is not None:
+                store_cached(CONFIG.gemini_model, prompt, text)
+                return json_text, text
+    return None, text
+
+def _read_one(full_path: str):
+    """Reads a candidate file with a single open and fstat.
+
+    Returns a (content, problem) tuple; content is None and problem says why when
+    the file is missing, too large, binary or unreadable.
+    """
+    try:
+        with open(full_path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size > MAX_FILE_BYTES:
+                return None, f"({size} bytes) is too large for the prompt size budget"
+            data = f.read()
+    except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+        return None, "does not exist or is not a file"
+    except OSError:
+        return None, "could not be read"
+    if b"\0" in data[:BINARY_SNIFF_BYTES]:
+        return None, "is binary"
+    return data.decode("utf-8", errors="ignore"), None
+
+def iter_files(repo_path: str, file_paths: list[str], log_entries: list[str] = None, token_budget: int = CODE_TOKEN_BUDGET):
+    """Yields (file_path, content) for readable files, staying within a token budget.
+
+    Files are packed greedily by information density (log tokens mentioned per
+    prompt token), so the budget is spent on the files most tied to the issue.
+    """
+    # File opens and reads release the GIL, so overlap them on a freshly cloned (cold cache) repo
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        results = list(executor.map(_read_one, [os.path.join(repo_path, file_path) for file_path in file_paths]))
+
+    tokens = _log_tokens(log_entries or [])
+    scored = []
+    for file_path, (content, problem) in zip(file_paths, results):
+        if content is None:
+            print(f"Warning: Skipping relevant file {file_path}: it {problem}.")
+            continue
+        token_count = _estimate_tokens(content)
+        hits = sum(1 for token in tokens if token in content)
+        scored.append((hits / token_count, file_path, content, token_count))
+
+    # sorted() is stable, so files with equal density keep the caller's order
+    used = 0
+    for _, file_path, content, token_count in sorted(scored, key=lambda item: item[0], reverse=True):
+        if used + token_count > token_budget:
+            print(f"Warning: Skipping file {file_path} (~{token_count} tokens) to stay within the prompt token budget.")
+            continue
+        used += token_count
+        yield file_path, content
+
+def _git_env() -> dict:
+    """Returns the environment for git subprocesses: never prompt, and skip optional index locks."""
+    return {**os.environ, "GIT_OPTIONAL_LOCKS": "0", "GIT_TERMINAL_PROMPT": "0"}
+
+# Fixed parts of the pull request description
+_PR_BODY_PREFIX = "This PR fixes the following issue: "
+_PR_LOG_ENTRIES_HEADER = "\n\n**Relevant Log Entries:**\n```\n"
+_PR_LOG_ENTRIES_FOOTER = "```"
+
+def _pr_body(issue: Issue) -> str:
+    """Builds the pull request description for an issue in a single join."""
+    return "".join([
+        _PR_BODY_PREFIX, issue.description, _PR_LOG_ENTRIES_HEADER,
+        *(entry + "\n" for entry in issue.log_entries), _PR_LOG_ENTRIES_FOOTER,
+    ])
+
+def create_pull_request(branch_name: str, issue: Issue, repo_url: str, pr_body: str = None):
     """Creates a pull request on GitHub."""
+    from src.tools import _gh
+
     try:
-        token = os.environ["GITHUB_TOKEN"]
+        token = CONFIG.github_token
+        if not token:
+            print("Error creating pull request: GITHUB_TOKEN environment variable not set.")
+            return
         repo_name = repo_url.replace("https://github.com/", "")
 
-        g = Github(token)
-        repo = g.get_repo(repo_name)
+        repo = _gh._get_repo(token, repo_name)
 
-        # Format log entries outside f-string to avoid backslash issues
-        log_entries_text = "\n".join(issue.log_entries)
-        pr_body = f"This PR fixes the following issue: {issue.description}\n\n**Relevant Log Entries:**\n```\n{log_entries_text}\n```"
+        if pr_body is None:
+            pr_body = _pr_body(issue)
 
         repo.create_pull(
             title=f"Fix: {issue.description}",
@@ -30,33 +269,67 @@ def create_pull_request(branch_name: str, issue: Issue, repo_url: str):
     except Exception as e:
         print(f"Error creating pull request: {e}")
 
+# Characters git rejects (or that make awkward refs) in a branch name, mapped to "-"
+_SLUG = str.maketrans({c: "-" for c in ' \t\n\r/\\:*?"<>|~^[]{}@.' + "".join(map(chr, range(32))) + chr(127)})
+
+def _slugify(text: str) -> str:
+    """Returns a lower-case, git-ref-safe slug of text, at most 40 characters long."""
+    slug = "-".join(part for part in text.translate(_SLUG).split("-") if part)
+    return slug[:40].rstrip("-").lower() or "fix"
+
+def _branch_name(issue: Issue) -> str:
+    """Returns the fix branch name; the hash suffix keeps issues with the same leading text apart."""
+    digest = hashlib.sha1(issue.description.encode()).hexdigest()[:6]
+    return f"fix/{_slugify(issue.description)}-{digest}"
+
+def _write_atomic(full_path: str, content: str):
+    """Writes content to full_path via a temp file and os.replace, so a crash never leaves a partial file."""
+    directory = os.path.dirname(full_path)
+    os.makedirs(directory, exist_ok=True)
+    # mkstemp creates the file as 0600; keep the original file's mode (or a normal default)
+    mode = os.stat(full_path).st_mode & 0o777 if os.path.exists(full_path) else 0o644
+    fd, tmp_path = tempfile.mkstemp(dir=directory)
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(content)
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, full_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
 def apply_fix(file_path: str, code_fix: str, issue: Issue, repo_url: str, repo_path: str):
     """Applies a code fix to a file in a new branch and creates a pull request."""
     
-    branch_name = f"fix/{issue.description.replace(' ', '-')[:20]}"
+    branch_name = _branch_name(issue)
     
     try:
-        # Create a new branch
-        subprocess.run(["git", "checkout", "-b", branch_name], check=True, cwd=repo_path)
-        
         # Apply the fix
         full_path = os.path.join(repo_path, file_path)
-        with open(full_path, "w") as f:
-            f.write(code_fix)
-            
-        # Stage the changes
-        subprocess.run(["git", "add", file_path], check=True, cwd=repo_path)
-        
-        # Commit the changes
-        subprocess.run(["git", "commit", "-m", f"Fix: {issue.description}"], check=True, cwd=repo_path)
-        
-        # Push the new branch
-        subprocess.run(["git", "push", "-u", "origin", branch_name], check=True, cwd=repo_path)
-        
+        _write_atomic(full_path, code_fix)
+
+        # Create the branch, stage and commit in a single invocation. `git add` stays
+        # explicit because `commit -a` would miss a fix that creates a new file.
+        git_script = (
+            "set -e; "
+            f"git checkout -b {shlex.quote(branch_name)} && "
+            f"git add -- {shlex.quote(file_path)} && "
+            f"git commit -m {shlex.quote(f'Fix: {issue.description}')}"
+        )
+        env = _git_env()
+        subprocess.run(["sh", "-c", git_script], check=True, cwd=repo_path, env=env)
+
+        # Push in the background while the pull request description is prepared
+        push_args = ["git", "push", "-u", "origin", branch_name]
+        push = subprocess.Popen(push_args, cwd=repo_path, env=env)
+        pr_body = _pr_body(issue)
+        if push.wait() != 0:
+            raise subprocess.CalledProcessError(push.returncode, push_args)
+
         print(f"Successfully applied fix in branch {branch_name}")
         
         # Create a pull request
-        create_pull_request(branch_name, issue, repo_url)
+        create_pull_request(branch_name, issue, repo_url, pr_body)
         
     except subprocess.CalledProcessError as e:
         print(f"Error applying fix: {e}")
@@ -67,21 +340,23 @@ def code_fixer_agent(issue: Issue, repo_url: str) -> str:
     """Analyzes an issue, reads the relevant code, and suggests a fix."""
 
     # Clone the repository to a temporary directory
-    import tempfile
     repo_path = tempfile.mkdtemp()
-    subprocess.run(["git", "clone", repo_url, repo_path], check=True)
+    # Shallow, blobless clone: only the tip commit is needed to read files and branch off it.
+    # Requires git >= 2.26, where the clone registers origin as a promisor remote and
+    # missing blobs are fetched on demand; overwritten files never need their old blob.
+    subprocess.run(["git", "clone", "--depth", "1", "--single-branch", "--filter=blob:none", repo_url, repo_path], check=True, env=_git_env())
 
-    # Get a list of all files in the repository
-    all_files = []
-    for root, _, files in os.walk(repo_path):
-        for file in files:
-            relative_path = os.path.relpath(os.path.join(root, file), repo_path)
-            all_files.append(relative_path)
+    # Get a list of all tracked files in the repository
+    all_files = list_tracked_files(repo_path)
+
+    # Only offer the LLM files that the log entries point at
+    candidate_files = select_candidate_files(repo_path, all_files, issue.log_entries)
+    print(f"Selected {len(candidate_files)} of {len(all_files)} files as candidates for the fix")
 
     # Use LLM to identify relevant files
     # Format strings outside f-string to avoid backslash issues
     log_entries_text = "\n".join(issue.log_entries)
-    all_files_text = "\n".join(all_files)
+    tree_summary = _summarize_tree(tuple(candidate_files))
 
     file_selection_prompt = f"""Given the following issue and log entries, and a list of files in the repository, identify the most relevant files that might need modification to fix the issue.
 
@@ -90,37 +365,36 @@ def code_fixer_agent(issue: Issue, repo_url: str) -> str:
     Log Entries:
     {log_entries_text}
 
-    All Files in Repository:
-    {all_files_text}
+    Candidate Files in Repository (one line per directory, "./" is the repository root):
+    {tree_summary}
 
-    Return a JSON array of the relative file paths that are most relevant. For example: ["src/main.py", "tests/test_main.py"]
+    Return a JSON array of the relative file paths (directory followed by file name) that are most relevant. For example: ["src/main.py", "tests/test_main.py"]
     """
-    file_selection_model = genai.GenerativeModel(os.getenv("GEMINI_MODEL_NAME", "gemini-2.5-flash"))
-    file_selection_response = file_selection_model.generate_content(file_selection_prompt)
+    file_selection_text = cached_generate(CONFIG.gemini_model, file_selection_prompt)
 
     relevant_files = []
     try:
-        match = re.search(r"```json\n(.*?)\n```", file_selection_response.text, re.DOTALL)
-        if match:
-            json_text = match.group(1)
-            relevant_files = json.loads(json_text)
+        json_text = _extract_json_block(file_selection_text)
+        if json_text is not None:
+            relevant_files = orjson.loads(json_text)
         else:
-            print(f"Error parsing file selection response: No JSON block found\nResponse text: {file_selection_response.text}")
+            print(f"Error parsing file selection response: No JSON block found\nResponse text: {file_selection_text}")
     except (json.JSONDecodeError, TypeError) as e:
-        print(f"Error parsing file selection response: {e}\nResponse text: {file_selection_response.text}")
+        print(f"Error parsing file selection response: {e}\nResponse text: {file_selection_text}")
 
-    # Read only the relevant files
-    code = ""
-    for file_path in relevant_files:
-        full_path = os.path.join(repo_path, file_path)
-        if os.path.exists(full_path) and os.path.isfile(full_path):
-            try:
-                with open(full_path, "r") as f:
-                    code += f"--- {file_path} ---\n{f.read()}\n"
-            except Exception:
-                print(f"Warning: Could not read file {file_path}")
+    # The prompt only shows a summary, so keep selections that name real tracked files
+    tracked = set(all_files)
+    selected_files = []
+    for file_path in relevant_files if isinstance(relevant_files, list) else []:
+        file_path = str(file_path).removeprefix("./")
+        if file_path in tracked:
+            selected_files.append(file_path)
         else:
-            print(f"Warning: Identified relevant file {file_path} does not exist or is not a file.")
+            print(f"Warning: Ignoring selected file {file_path}, which is not tracked in the repository.")
+    relevant_files = selected_files
+
+    # Read only the relevant files
+    code = "".join(f"--- {file_path} ---\n{content}\n" for file_path, content in iter_files(repo_path, relevant_files, issue.log_entries))
 
     # Format log entries outside f-string to avoid backslash issues
     log_entries_text_2 = "\n".join(issue.log_entries)
@@ -140,15 +414,12 @@ def code_fixer_agent(issue: Issue, repo_url: str) -> str:
     The 'code_fix' should be the complete code for the file with the fix applied.
     """
 
-    model = genai.GenerativeModel(os.getenv("GEMINI_MODEL_NAME", "gemini-2.5-flash"))
-    response = model.generate_content(prompt)
+    # The response may contain markdown, so we need to extract the JSON part
+    json_text, response_text = _stream_json_block(prompt)
 
     try:
-        # The response may contain markdown, so we need to extract the JSON part
-        match = re.search(r"```json\n(.*?)\n```", response.text, re.DOTALL)
-        if match:
-            json_text = match.group(1)
-            fix_data = json.loads(json_text)
+        if json_text is not None:
+            fix_data = orjson.loads(json_text)
             
             file_path = fix_data['file_path']
             code_fix = fix_data['code_fix']
@@ -157,9 +428,9 @@ def code_fixer_agent(issue: Issue, repo_url: str) -> str:
             
             return f"Fix applied and pull request created for issue: {issue.description}"
         else:
-            print(f"Error parsing response from Gemini API: No JSON block found\nResponse text: {response.text}")
+            print(f"Error parsing response from Gemini API: No JSON block found\nResponse text: {response_text}")
             return f"Error applying fix for issue: {issue.description}"
         
     except (json.JSONDecodeError, TypeError, KeyError) as e:
-        print(f"Error parsing response from Gemini API: {e}\nResponse text: {response.text}")
-        return f"Error applying fix for issue: {issue.description}"
\ No newline at end of file
+        print(f"Error parsing response from Gemini API: {e}\nResponse text: {response_text}")
+        return f"Error applying fix for issue: {issue.description}"
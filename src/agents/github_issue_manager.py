@@ -1,10 +1,147 @@
 
-import os
 import json
-from github import Github
-import google.generativeai as genai
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from github import GithubException
+from src.tools import _gh
+from src.config import CONFIG
+from src.agents._json import _parse_json_block
 from src.agents.issue_creation_agent import Issue
+from src.agents._llm_cache import cached_generate
 from ..tools.github_tool import get_github_issues
+from ..tools.cache import _cached_get_github_issues
+
+logger = logging.getLogger(__name__)
+
+def _index_by_title(existing_issues: list[dict]) -> dict[str, dict]:
+    """Indexes existing issues by title, preferring open issues and then the most recent one."""
+    existing_by_title = {}
+    for existing_issue in existing_issues:
+        title = existing_issue['title']
+        current = existing_by_title.get(title)
+        if current is None or (
+            (existing_issue['state'] == 'open', existing_issue.get('number', 0))
+            > (current['state'] == 'open', current.get('number', 0))
+        ):
+            existing_by_title[title] = existing_issue
+    return existing_by_title
+
+# Batches up to this size look up each title with the search API instead of listing every issue
+SEARCH_LOOKUP_MAX_TITLES = 3
+# Search results examined per title; one page, since exact matches rank first
+SEARCH_MAX_RESULTS = 30
+
+# Issues created by this process, keyed by (repo_url, title). The search index lags behind
+# issue creation, so a title filed moments ago would otherwise not be found again.
+RECENTLY_CREATED_MAX_ENTRIES = 1024
+_recently_created = OrderedDict()
+_recently_created_lock = threading.Lock()
+
+def _remember_created(repo_url: str, title: str, number: int):
+    """Records an issue this process just created, evicting the oldest beyond the limit."""
+    with _recently_created_lock:
+        _recently_created[(repo_url, title)] = {"title": title, "number": number, "state": "open", "labels": []}
+        while len(_recently_created) > RECENTLY_CREATED_MAX_ENTRIES:
+            _recently_created.popitem(last=False)
+
+def _recall_created(repo_url: str, titles) -> list[dict]:
+    """Returns the issues this process created in repo_url with any of titles."""
+    with _recently_created_lock:
+        return [_recently_created[(repo_url, title)] for title in titles if (repo_url, title) in _recently_created]
+
+def _search_title(client, repo_name: str, title: str) -> list[dict]:
+    """Returns the issues in repo_name whose title is exactly title, from the first page of results."""
+    # Quotes would end the phrase early; the search is fuzzy anyway, so keep only exact matches
+    phrase = title.replace('"', ' ')
+    query = f'repo:{repo_name} is:issue in:title "{phrase}"'
+    return [
+        {
+            "title": found.title,
+            "number": found.number,
+            "state": found.state,
+            "labels": [label.name for label in found.labels],
+        }
+        for found in islice(client.search_issues(query), SEARCH_MAX_RESULTS)
+        if found.title == title
+    ]
+
+def _lookup_existing(token: str, repo_url: str, titles: list[str]) -> dict[str, dict]:
+    """Returns existing issues matching titles, indexed by title.
+
+    Small batches issue one search query per title, concurrently; larger batches list all issues once.
+    Issues this process created recently are included either way.
+    """
+    unique_titles = set(titles)
+    recent = _recall_created(repo_url, unique_titles)
+    if len(unique_titles) > SEARCH_LOOKUP_MAX_TITLES:
+        return _index_by_title(get_github_issues(repo_url) + recent)
+
+    repo_name = repo_url.replace("https://github.com/", "")
+    client = _gh._get_client(token)
+    if len(unique_titles) == 1:
+        return _index_by_title(_search_title(client, repo_name, *unique_titles) + recent)
+    with ThreadPoolExecutor(max_workers=SEARCH_LOOKUP_MAX_TITLES) as executor:
+        results = executor.map(lambda title: _search_title(client, repo_name, title), unique_titles)
+        return _index_by_title([match for matches in results for match in matches] + recent)
+
+# Fixed parts of the issue body wrapped around the log entries
+_LOG_ENTRIES_HEADER = "\n\n**Relevant Log Entries:**\n```\n"
+_LOG_ENTRIES_FOOTER = "```\n"
+
+# Concurrent create_issue calls; small enough to stay clear of GitHub's secondary rate limits
+MAX_CREATE_WORKERS = 8
+# Fallback wait when a secondary rate limit response carries no Retry-After header
+DEFAULT_RETRY_AFTER_SECONDS = 60
+
+def _headers(e: GithubException) -> dict:
+    """Returns the error response's headers with lower-cased names."""
+    return {name.lower(): value for name, value in (e.headers or {}).items()}
+
+def _is_rate_limited(e: GithubException) -> bool:
+    """Tells a rate limit 403 apart from other 403s, such as a token missing a scope."""
+    if e.status != 403:
+        return False
+    headers = _headers(e)
+    return ("retry-after" in headers
+            or headers.get("x-ratelimit-remaining") == "0"
+            or "secondary rate limit" in str(e.data).lower())
+
+def _retry_after_seconds(e: GithubException) -> int:
+    """Returns the wait requested by Retry-After, given as seconds or an HTTP date.
+
+    A missing or unparseable header falls back to DEFAULT_RETRY_AFTER_SECONDS.
+    """
+    value = str(_headers(e).get("retry-after", "")).strip()
+    if value.isdigit():
+        return int(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return DEFAULT_RETRY_AFTER_SECONDS
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0, int((retry_at - datetime.now(timezone.utc)).total_seconds()))
+
+def _create_issue(repo, title: str, body: str, labels: list[str]):
+    """Creates an issue, waiting out and retrying once on a rate limit (HTTP 403).
+
+    Other 403s (e.g. missing permissions, issues disabled) are raised at once.
+    """
+    try:
+        return repo.create_issue(title=title, body=body, labels=labels)
+    except GithubException as e:
+        if not _is_rate_limited(e):
+            raise
+        retry_after = _retry_after_seconds(e)
+        print(f"[github_issue_manager] ⏳ Rate limited, retrying '{title[:100]}' in {retry_after}s...")
+        time.sleep(retry_after)
+        return repo.create_issue(title=title, body=body, labels=labels)
 
 def github_issue_manager_agent(issues: list[Issue], repo_url: str, user_query: str = None, issue_content: str = None):
     """Creates GitHub issues for a list of issues."""
@@ -20,18 +157,11 @@ def github_issue_manager_agent(issues: list[Issue], repo_url: str, user_query: s
 
         User Query: {user_query}
         """
-        model = genai.GenerativeModel(os.getenv("GEMINI_MODEL_NAME", "gemini-2.5-flash"))
-        response = model.generate_content(prompt)
-        raw_response_text = response.text
-        print(f"Gemini API raw response: {raw_response_text}")
-        # Strip markdown code block syntax if present
-        if raw_response_text.startswith('```json') and raw_response_text.endswith('```'):
-            json_string = raw_response_text[len('```json\n'):-len('\n```')]
-        else:
-            json_string = raw_response_text
-
+        raw_response_text = cached_generate(CONFIG.gemini_model, prompt)
+        logger.debug("Gemini API raw response: %s", raw_response_text)
         try:
-            issue_data = json.loads(json_string)
+            # Skips any markdown fence around the JSON object
+            issue_data = _parse_json_block(raw_response_text)
             if issue_data:
                 issues = [Issue(description=issue_data['title'], priority="High", log_entries=[issue_data['body']])] 
         except (json.JSONDecodeError, TypeError) as e:
@@ -41,79 +171,84 @@ def github_issue_manager_agent(issues: list[Issue], repo_url: str, user_query: s
     if not repo_url:
         return {"github_issue_manager_history": ["Error: GitHub repository URL not set."]}
 
+    # Drop repeated titles up front so they cost neither a lookup nor a create call
+    seen_titles = set()
+    unique_issues = []
+    batch_duplicates = []
+    for issue in issues:
+        title = issue.description[:256] # Use the description as the title, up to 256 chars
+        if title in seen_titles:
+            batch_duplicates.append(title)
+        else:
+            seen_titles.add(title)
+            unique_issues.append(issue)
+
     try:
-        # Get GitHub token from environment variables
-        token = os.environ.get("GITHUB_TOKEN")
+        # GitHub token, read from the environment at import time
+        token = CONFIG.github_token
         if not token:
             return {"github_issue_manager_history": ["Error: GITHUB_TOKEN environment variable not set."]}
         
         # Get repo name from URL
         repo_name = repo_url.replace("https://github.com/", "")
 
-        # Initialize Github object
-        g = Github(token)
-
-        # Get the repository
-        repo = g.get_repo(repo_name)
+        # Get the repository (resolved once per token and repository)
+        repo = _gh._get_repo(token, repo_name)
 
-        # Get existing issues
-        existing_issues = get_github_issues(repo_url)
-        existing_titles = [issue['title'] for issue in existing_issues]
+        # Get existing issues with the same titles
+        existing_by_title = _lookup_existing(token, repo_url, list(seen_titles))
 
     except Exception as e:
         return {"github_issue_manager_history": [f"Error initializing GitHub: {e}"]}
 
     created_issues = 0
-    skipped_issues = 0
-    skipped_reasons = []
+    skipped_issues = len(batch_duplicates)
+    skipped_reasons = [f"Issue '{title[:100]}...' appears more than once in this batch" for title in batch_duplicates]
     error_messages = []
 
-    print(f"\n[github_issue_manager] Processing {len(issues)} issues...")
-    print(f"[github_issue_manager] Found {len(existing_issues)} existing issues in repository")
+    print(f"\n[github_issue_manager] Processing {len(issues)} issues ({len(batch_duplicates)} in-batch duplicates skipped)...")
+    print(f"[github_issue_manager] Found {len(existing_by_title)} existing issue title(s) to check against")
 
-    for i, issue in enumerate(issues):
-        try:
-            title = issue.description[:256] # Use the description as the title, up to 256 chars
-            print(f"\n[github_issue_manager] Issue {i+1}/{len(issues)}: '{title}'")
-            print(f"[github_issue_manager] Priority: {issue.priority}")
-
-            # Check if this issue already exists (open or closed)
-            if title in existing_titles:
-                print(f"[github_issue_manager] ⚠️  Title matches existing issue, checking status...")
-                for existing_issue in existing_issues:
-                    if existing_issue['title'] == title:
-                        state = existing_issue['state']
-                        number = existing_issue.get('number', 'unknown')
-                        reason = f"Issue '{title[:100]}...' already exists as {state} issue (#{number})"
-                        print(f"[github_issue_manager] ❌ SKIPPED: {reason}")
-                        skipped_issues += 1
-                        skipped_reasons.append(reason)
-                        break
-            else:
-                print(f"[github_issue_manager] ✓ No duplicate found, creating new issue...")
-
-            # Only create if title is NOT in existing titles
-            if title not in existing_titles:
-                log_entries_str = "\n".join(issue.log_entries)
-                body = f"""{issue.description}
-
-**Relevant Log Entries:**
-```
-{log_entries_str}
-```
-"""
-                print(f"[github_issue_manager] 📝 Calling GitHub API to create issue...")
-                result = repo.create_issue(
-                    title=title,
-                    body=body,
-                    labels=[issue.priority]
-                )
-                print(f"[github_issue_manager] ✅ SUCCESS! Created issue #{result.number}: {result.html_url}")
-                created_issues += 1
-        except Exception as e:
-            error_msg = f"Error creating issue '{title[:100]}...': {str(e)}"
-            print(f"[github_issue_manager] ❌ ERROR: {error_msg}")
-            error_messages.append(error_msg)
+    # Duplicate checks run serially; only the GitHub API calls are made concurrently
+    to_create = []
+    for i, issue in enumerate(unique_issues):
+        title = issue.description[:256]
+        print(f"\n[github_issue_manager] Issue {i+1}/{len(unique_issues)}: '{title}'")
+        print(f"[github_issue_manager] Priority: {issue.priority}")
+
+        # Check if this issue already exists (open or closed)
+        hit = existing_by_title.get(title)
+        if hit is not None:
+            state = hit['state']
+            number = hit.get('number', 'unknown')
+            reason = f"Issue '{title[:100]}...' already exists as {state} issue (#{number})"
+            print(f"[github_issue_manager] ❌ SKIPPED: {reason}")
+            skipped_issues += 1
+            skipped_reasons.append(reason)
+        else:
+            print(f"[github_issue_manager] ✓ No duplicate found, creating new issue...")
+            body = "".join([issue.description, _LOG_ENTRIES_HEADER, *(entry + "\n" for entry in issue.log_entries), _LOG_ENTRIES_FOOTER])
+            to_create.append((title, body, [issue.priority]))
+
+    if to_create:
+        print(f"[github_issue_manager] 📝 Calling GitHub API to create {len(to_create)} issue(s)...")
+        with ThreadPoolExecutor(max_workers=MAX_CREATE_WORKERS) as executor:
+            futures = {executor.submit(_create_issue, repo, *args): args[0] for args in to_create}
+            for future in as_completed(futures):
+                title = futures[future]
+                try:
+                    result = future.result()
+                    print(f"[github_issue_manager] ✅ SUCCESS! Created issue #{result.number}: {result.html_url}")
+                    _remember_created(repo_url, title, result.number)
+                    created_issues += 1
+                except Exception as e:
+                    error_msg = f"Error creating issue '{title[:100]}...': {str(e)}"
+                    print(f"[github_issue_manager] ❌ ERROR: {error_msg}")
+                    error_messages.append(error_msg)
+
+    if created_issues:
+        # Later duplicate checks in this session must see the new issues
+        _cached_get_github_issues.cache_clear()
 
     # Build detailed status message
     status_parts = [f"Created {created_issues} GitHub issue(s), skipped {skipped_issues}."]
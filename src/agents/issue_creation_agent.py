@@ -1,10 +1,14 @@
-import os
-import json
-from pydantic import BaseModel
-import google.generativeai as genai
+import logging
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from pydantic import BaseModel, TypeAdapter
+from src.config import CONFIG
+from src.agents._logs import _compress_logs, _has_problem_lines, _line_count
+from src.agents._llm_cache import _model
 
-from src.tools.gcp_logging_tool import get_gcp_logs
-from src.tools.github_tool import get_github_issues
+from src.tools.cache import _cached_get_gcp_logs, _cached_get_github_issues
+
+logger = logging.getLogger(__name__)
 
 class Issue(BaseModel):
     """Represents an issue identified in the logs."""
@@ -12,11 +16,80 @@ class Issue(BaseModel):
     priority: str
     log_entries: list[str]
 
-def issue_creation_agent(service_name: str, repo_url: str) -> list[Issue]:
+# Validates a whole decoded response in one pydantic-core call
+_ISSUE_LIST = TypeAdapter(list[Issue])
+
+# Fixed instructions of the issue analysis prompt. They come first and never vary, so
+# consecutive calls share a prompt prefix that Gemini's implicit context caching can reuse;
+# the existing issues and logs follow.
+_PROMPT_INSTRUCTIONS = """Analyze the logs below and identify any potential issues, errors, warnings, or problems that should be tracked.
+
+IMPORTANT INSTRUCTIONS:
+- Look for actual problems, errors, warnings, misconfigurations, or performance issues
+- Each issue should be actionable and specific
+- Avoid creating issues that are duplicates of existing ones (listed below)
+- If you find problems in the logs, you MUST create issues for them
+- Return a JSON array even if there are no issues (return empty array [])
+
+For each new issue you identify, provide:
+- description: A clear, concise title describing the issue
+- priority: "High" (critical/blocking), "Medium" (important), or "Low" (minor)
+- log_entries: Array of relevant log lines that show the problem
+
+Output Format (JSON array):
+[
+    {
+        "description": "404 errors on /chat/completions endpoint",
+        "priority": "High",
+        "log_entries": [
+            "POST /chat/completions - 404 Not Found",
+            "Error: Endpoint not registered"
+        ]
+    },
+    {
+        "description": "ulimit warning may cause file descriptor exhaustion",
+        "priority": "Medium",
+        "log_entries": [
+            "WARNING: Failed to increase ulimit"
+        ]
+    }
+]
+
+If no issues are found, return: []
+
+Existing Issues (do not duplicate these):
+"""
+_PROMPT_LOGS = """
+
+Logs to analyze:
+"""
+_PROMPT_FOOTER = "\n"
+
+# JSON mode: Gemini returns a bare JSON array matching the Issue schema, with no markdown
+# around it, so the response can be decoded directly
+_GENERATION_CONFIG = {
+    "response_mime_type": "application/json",
+    "response_schema": list[Issue],
+}
+
+def issue_creation_agent(service_name: str, repo_url: str, service_type: str = "cloud_run") -> list[Issue]:
     """Analyzes log files and generates issues in every case."""
 
     print(f"[issue_creation_agent] Fetching logs for service: {service_name}")
-    logs, _, error = get_gcp_logs(service_name=service_name, limit=1000)
+    if repo_url:
+        print(f"[issue_creation_agent] Fetching existing issues from {repo_url}")
+    else:
+        print("[issue_creation_agent] No repo_url provided, skipping duplicate check")
+
+    # The log and issue fetches hit independent services, so overlap their round trips.
+    # The log fetch uses the same arguments as the log explorer running alongside this
+    # agent, so the two share a single fetch.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        logs_future = executor.submit(_cached_get_gcp_logs, service_name=service_name, service_type=service_type,
+                                      limit=1000, start_time=None, end_time=None)
+        issues_future = executor.submit(_cached_get_github_issues, repo_url) if repo_url else None
+        logs, _, error = logs_future.result()
+        existing_issues = issues_future.result() if issues_future else []
 
     if error:
         print(f"[issue_creation_agent] Error fetching logs: {error}")
@@ -25,69 +98,28 @@ def issue_creation_agent(service_name: str, repo_url: str) -> list[Issue]:
         print("[issue_creation_agent] No logs found for the specified service and time range.")
         return []
 
-    print(f"[issue_creation_agent] Successfully fetched {len(logs.splitlines())} log lines")
-
-    existing_issues = []
+    print(f"[issue_creation_agent] Successfully fetched {_line_count(logs)} log lines")
+    # Purely informational logs cannot yield an issue, so don't spend a model call on them
+    if not _has_problem_lines(logs):
+        print("[issue_creation_agent] ℹ️ No error, warning or failure lines in the logs, skipping analysis")
+        return []
+    # Only error-like lines (with context) are worth the prompt tokens on large fetches
+    logs = _compress_logs(logs)
+    print(f"[issue_creation_agent] Sending {_line_count(logs)} log lines to Gemini")
     if repo_url:
-        print(f"[issue_creation_agent] Fetching existing issues from {repo_url}")
-        existing_issues = get_github_issues(repo_url)
         print(f"[issue_creation_agent] Found {len(existing_issues)} existing issues")
-    else:
-        print("[issue_creation_agent] No repo_url provided, skipping duplicate check")
 
-    existing_issues_str = "\n".join(str(issue) for issue in existing_issues) if existing_issues else "No existing issues."
-
-    prompt = f"""Analyze the following logs and identify any potential issues, errors, warnings, or problems that should be tracked.
-
-    IMPORTANT INSTRUCTIONS:
-    - Look for actual problems, errors, warnings, misconfigurations, or performance issues
-    - Each issue should be actionable and specific
-    - Avoid creating issues that are duplicates of existing ones (listed below)
-    - If you find problems in the logs, you MUST create issues for them
-    - Return a JSON array even if there are no issues (return empty array [])
-
-    Existing Issues (do not duplicate these):
-    {existing_issues_str}
-
-    For each new issue you identify, provide:
-    - description: A clear, concise title describing the issue
-    - priority: "High" (critical/blocking), "Medium" (important), or "Low" (minor)
-    - log_entries: Array of relevant log lines that show the problem
-
-    Output Format (JSON array):
-    [
-        {{
-            "description": "404 errors on /chat/completions endpoint",
-            "priority": "High",
-            "log_entries": [
-                "POST /chat/completions - 404 Not Found",
-                "Error: Endpoint not registered"
-            ]
-        }},
-        {{
-            "description": "ulimit warning may cause file descriptor exhaustion",
-            "priority": "Medium",
-            "log_entries": [
-                "WARNING: Failed to increase ulimit"
-            ]
-        }}
-    ]
-
-    If no issues are found, return: []
-
-    Logs to analyze:
-    {logs}
-    """
-
-    model = genai.GenerativeModel(os.getenv("GEMINI_MODEL_NAME", "gemini-2.5-flash"))
+    existing_issues_str = "\n".join([str(issue) for issue in existing_issues]) if existing_issues else "No existing issues."
+
+    prompt = "".join((_PROMPT_INSTRUCTIONS, existing_issues_str, _PROMPT_LOGS, logs, _PROMPT_FOOTER))
+
+    model = _model(CONFIG.gemini_model)
     print("[issue_creation_agent] Calling Gemini API to analyze logs...")
-    response = model.generate_content(prompt)
+    response = model.generate_content(prompt, generation_config=_GENERATION_CONFIG)
 
     try:
-        # The response may contain markdown, so we need to extract the JSON part
-        print(f"[issue_creation_agent] Raw Gemini response: {response.text[:500]}...")
-        json_text = response.text.strip(" `").lstrip("json\n").rstrip("\n`")
-        issues_data = json.loads(json_text)
+        logger.debug("[issue_creation_agent] Raw Gemini response: %.500s...", response.text)
+        issues_data = orjson.loads(response.text)
 
         if not isinstance(issues_data, list):
             print(f"[issue_creation_agent] ⚠️ WARNING: Expected JSON array but got {type(issues_data)}")
@@ -102,13 +134,13 @@ def issue_creation_agent(service_name: str, repo_url: str) -> list[Issue]:
             print("  - The logs are purely informational")
             return []
 
-        issues = [Issue(**issue_data) for issue_data in issues_data]
+        issues = _ISSUE_LIST.validate_python(issues_data)
         print(f"[issue_creation_agent] ✅ Successfully parsed {len(issues)} issue(s) from Gemini response")
         for i, issue in enumerate(issues):
             print(f"  {i+1}. {issue.description} (Priority: {issue.priority})")
 
         return issues
-    except (json.JSONDecodeError, TypeError) as e:
+    except (ValueError, TypeError) as e:
         print(f"[issue_creation_agent] ❌ ERROR parsing response from Gemini API: {e}")
         print(f"[issue_creation_agent] This likely means Gemini didn't return valid JSON")
         print(f"[issue_creation_agent] Full response text: {response.text}")
@@ -1,13 +1,61 @@
-import os
-import google.generativeai as genai
+import logging
+from src.config import CONFIG
+from src.agents._semantic_cache import answer_cache
+from src.agents._llm_cache import _model, stream_generate
+from src.agents._logs import COMPRESS_MIN_LINES, _line_count
 from langchain_core.messages import HumanMessage, AIMessage
 
-from src.tools.gcp_logging_tool import get_gcp_logs
+from src.tools.cache import _cached_get_gcp_logs
 
-def log_explorer_agent(service_name: str, user_query: str, service_type: str = "cloud_run", conversation_history: list = None, start_time: str = None, end_time: str = None) -> str:
-    """Dynamically answers questions about log content and explores potential issues."""
+logger = logging.getLogger(__name__)
 
-    logs, _, error = get_gcp_logs(service_name=service_name, service_type=service_type, limit=1000, start_time=start_time, end_time=end_time)
+# Fixed parts of the summarization and answer prompts, joined around the variable sections
+_SUMMARY_PROMPT_HEADER = """The following are logs for a service. Summarize the key events, errors, or relevant information related to the user's question.
+
+User Question: """
+_SUMMARY_PROMPT_MID = """
+Logs:
+"""
+_SUMMARY_PROMPT_FOOTER = """
+
+Provide a concise summary of the most relevant log entries. If the user asks for a summary, provide it in a structured format (e.g., bullet points or a brief paragraph).
+"""
+
+_ANSWER_PROMPT_HEADER = """You are a helpful log analysis assistant. Answer the user's question based on the provided conversation history and the processed logs.
+
+Conversation History:
+"""
+_ANSWER_PROMPT_LOGS = """
+
+Processed Logs:
+"""
+_ANSWER_PROMPT_QUESTION = """
+
+User Question: """
+_ANSWER_PROMPT_FOOTER = """
+
+If the user asks for a summary or specific structured information, provide it in a clear and concise structured format (e.g., bullet points, numbered list, or a brief JSON snippet if appropriate).
+"""
+
+def log_explorer_agent(service_name: str, user_query: str, service_type: str = "cloud_run", conversation_history: list = None, start_time: str = None, end_time: str = None, on_chunk=None) -> str:
+    """Dynamically answers questions about log content and explores potential issues.
+
+    If on_chunk is given, it is called with each piece of the answer as it streams in.
+    Opening questions that mean the same as a recent one for the same service reuse its answer.
+    """
+
+    # Follow-up questions depend on the conversation, so only opening questions are cached
+    embedding = None
+    cache_namespace = ("log_explorer", service_type, service_name, start_time, end_time)
+    opening_question = not conversation_history or len(conversation_history) <= 1
+    if opening_question:
+        cached_answer, embedding = answer_cache.lookup(cache_namespace, user_query)
+        if cached_answer is not None:
+            if on_chunk is not None:
+                on_chunk(cached_answer)
+            return cached_answer
+
+    logs, _, error = _cached_get_gcp_logs(service_name=service_name, service_type=service_type, limit=1000, start_time=start_time, end_time=end_time)
 
     if error:
         return f"I couldn't fetch any logs. Please ensure the service name is correct and that I have the right permissions. Error: {error}"
@@ -25,43 +73,27 @@ Debug information has been logged to the server console. Please check the uvicor
 
     # Pre-process logs for large volumes or specific queries
     processed_logs = logs
-    if len(logs.splitlines()) > 200 or "summarize" in user_query.lower() or "summary" in user_query.lower():
-        summarization_prompt = f"""The following are logs for a service. Summarize the key events, errors, or relevant information related to the user's question.
-
-        User Question: {user_query}
-        Logs:
-        {logs}
-
-        Provide a concise summary of the most relevant log entries. If the user asks for a summary, provide it in a structured format (e.g., bullet points or a brief paragraph).
-        """
-        summarization_model = genai.GenerativeModel(os.getenv("GEMINI_MODEL_NAME", "gemini-2.5-flash"))
+    if _line_count(logs) > COMPRESS_MIN_LINES or "summarize" in user_query.lower() or "summary" in user_query.lower():
+        summarization_prompt = "".join((_SUMMARY_PROMPT_HEADER, user_query, _SUMMARY_PROMPT_MID, logs, _SUMMARY_PROMPT_FOOTER))
+        summarization_model = _model(CONFIG.gemini_model)
         summarization_response = summarization_model.generate_content(summarization_prompt)
         processed_logs = summarization_response.text
 
-    # Format the conversation history
-    formatted_history = ""
-    if conversation_history:
-        for msg in conversation_history:
-            if isinstance(msg, HumanMessage):
-                formatted_history += f"User: {msg.content}\n"
-            elif isinstance(msg, AIMessage):
-                formatted_history += f"Bot: {msg.content}\n"
-
-    prompt = f"""You are a helpful log analysis assistant. Answer the user's question based on the provided conversation history and the processed logs.
-
-    Conversation History:
-    {formatted_history}
-
-    Processed Logs:
-    {processed_logs}
-
-    User Question: {user_query}
-
-    If the user asks for a summary or specific structured information, provide it in a clear and concise structured format (e.g., bullet points, numbered list, or a brief JSON snippet if appropriate).
-    """
-
-    model = genai.GenerativeModel(os.getenv("GEMINI_MODEL_NAME", "gemini-2.5-flash"))
-    response = model.generate_content(prompt)
-    print(f"Log Explorer Agent Raw Response: {response}")
-    print(f"Log Explorer Agent Response Text: {response.text}")
-    return response.text
+    # Format the earlier turns. The history comes first in the prompt and only grows at the
+    # end, so successive turns share a prefix that Gemini's implicit context caching can reuse.
+    # The current question is left out here; it is sent once, after the logs.
+    prior_turns = conversation_history or []
+    if prior_turns and isinstance(prior_turns[-1], HumanMessage) and prior_turns[-1].content == user_query:
+        prior_turns = prior_turns[:-1]
+    formatted_history = "".join([
+        f"User: {msg.content}\n" if isinstance(msg, HumanMessage) else f"Bot: {msg.content}\n"
+        for msg in prior_turns if isinstance(msg, (HumanMessage, AIMessage))
+    ])
+
+    prompt = "".join((_ANSWER_PROMPT_HEADER, formatted_history, _ANSWER_PROMPT_LOGS, processed_logs, _ANSWER_PROMPT_QUESTION, user_query, _ANSWER_PROMPT_FOOTER))
+
+    response_text = stream_generate(CONFIG.gemini_model, prompt, on_chunk)
+    logger.debug("Log Explorer Agent Response Text: %s", response_text)
+    if response_text and opening_question:
+        answer_cache.store(cache_namespace, user_query, response_text, embedding)
+    return response_text
@@ -1,17 +1,52 @@
-import re
-import os
-from src.tools.gcp_logging_tool import get_gcp_logs
-import google.generativeai as genai
+import logging
+from src.tools.cache import _cached_get_gcp_logs
+from src.config import CONFIG
+from src.agents._llm_cache import stream_generate
+from src.agents._semantic_cache import answer_cache
 
-def solutions_agent(issue: dict, user_query: str, service_name: str):
+logger = logging.getLogger(__name__)
+
+# Fixed parts of the log analysis prompt, joined around the query, service name and logs
+_PROMPT_HEADER = (
+    "You are an expert in analyzing Google Cloud Run logs and providing solutions for performance optimization, "
+    "especially related to cold starts and specific technical issues like CUDA graph capturing.\n\n"
+    'Here is a user\'s query: "'
+)
+_PROMPT_SERVICE = '"\n\nHere are the recent logs for the service \''
+_PROMPT_LOGS = "':\n"
+_PROMPT_FOOTER = """
+
+Based on the user's query and the provided logs, please provide a detailed solution or set of recommendations in a numbered list format. Focus on: 
+1. Identifying any relevant information in the logs related to the query.
+2. Explaining how this information relates to the query.
+3. Proposing concrete, actionable steps to address the user's concern, especially regarding cold start optimization, CUDA graph caching, or build stage improvements. If the logs don't directly address the query, provide general but detailed best practices for the mentioned topics.
+
+Your response should be comprehensive, easy to understand, and clearly numbered for each recommendation."""
+
+def solutions_agent(issue: dict, user_query: str, service_name: str, on_chunk=None, conversation_history: list = None):
+    """Proposes a solution for an issue from the service's recent logs.
+
+    If on_chunk is given, it is called with each piece of the solution as it streams in.
+    Only the opening question of a conversation is answered from or added to the answer cache,
+    since follow-ups depend on what came before.
+    """
     print("--- Solutions Agent called ---")
     issue_title = issue.get('title', user_query)
     print(f"Solutions agent is providing a solution for: {issue_title}")
 
-    # Use the provided service_name directly
-    logs, _, error = get_gcp_logs(service_name=service_name, limit=100)
+    # A recent solution for a query meaning the same thing, for the same service and issue
+    embedding = None
+    cache_namespace = ("solutions", service_name, repr(issue))
+    opening_question = not conversation_history or len(conversation_history) <= 1
+    if opening_question:
+        cached_solution, embedding = answer_cache.lookup(cache_namespace, user_query)
+        if cached_solution is not None:
+            if on_chunk is not None:
+                on_chunk(cached_solution)
+            return cached_solution
 
-    model = genai.GenerativeModel(os.getenv("GEMINI_MODEL_NAME", "gemini-2.5-flash"))
+    # Use the provided service_name directly
+    logs, _, error = _cached_get_gcp_logs(service_name=service_name, limit=100)
 
     if error:
         solution_text = f"Could not fetch logs for service '{service_name}' due to an error: {error}. Please check the service name and permissions."
@@ -19,27 +54,16 @@ def solutions_agent(issue: dict, user_query: str, service_name: str):
         solution_text = f"No logs found for service '{service_name}'. It's difficult to propose a solution without logs. Consider checking if the service is running or if the logs are being exported correctly. Based on your query: '{user_query}', a potential solution could involve optimizing the cold start process by pre-warming the service or caching frequently used resources."
     else:
         # Use the LLM to analyze the logs in the context of the user query
-        log_analysis_prompt = f"""You are an expert in analyzing Google Cloud Run logs and providing solutions for performance optimization, especially related to cold starts and specific technical issues like CUDA graph capturing.
-
-Here is a user's query: "{user_query}"
-
-Here are the recent logs for the service '{service_name}':
-{logs}
-
-Based on the user's query and the provided logs, please provide a detailed solution or set of recommendations in a numbered list format. Focus on: 
-1. Identifying any relevant information in the logs related to the query.
-2. Explaining how this information relates to the query.
-3. Proposing concrete, actionable steps to address the user's concern, especially regarding cold start optimization, CUDA graph caching, or build stage improvements. If the logs don't directly address the query, provide general but detailed best practices for the mentioned topics.
-
-Your response should be comprehensive, easy to understand, and clearly numbered for each recommendation."""
+        log_analysis_prompt = "".join((_PROMPT_HEADER, user_query, _PROMPT_SERVICE, service_name, _PROMPT_LOGS, logs, _PROMPT_FOOTER))
         print("--- Calling LLM for log analysis ---")
-        response = model.generate_content(log_analysis_prompt)
+        response_text = stream_generate(CONFIG.gemini_model, log_analysis_prompt, on_chunk)
         print("--- LLM call returned ---")
-        if response.text:
-            solution_text = response.text
+        if response_text:
+            solution_text = response_text
+            if opening_question:
+                answer_cache.store(cache_namespace, user_query, solution_text, embedding)
         else:
             solution_text = "The model did not return a solution. This might be due to safety settings or an empty response. Please try rephrasing your query."
 
-    print(f"Solutions agent final solution_text: {solution_text}")
-    return solution_text
+    logger.debug("Solutions agent final solution_text: %s", solution_text)
     return solution_text
@@ -1,78 +1,191 @@
-import os
-import google.generativeai as genai
+import re
 import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
 from langchain_core.messages import HumanMessage, AIMessage
+from src.config import CONFIG
+from src.agents._json import _parse_json_block
+from src.agents._llm_cache import cached_generate
 
-def supervisor_agent(user_query: str, conversation_history: list):
-    """A supervisor agent that routes requests to other agents using a few-shot prompting strategy."""
+# Static routing instructions and few-shot examples. They are sent as the system instruction,
+# so every call shares the same prefix and Gemini's implicit context caching can reuse it.
+_SUPERVISOR_INSTRUCTIONS = """You are a supervisor agent. Your job is to analyze user requests and extract key information.
+
+IMPORTANT: Always extract the GitHub repository URL if mentioned in the query, regardless of what the user is asking to do.
+The repo_url should be in the format: https://github.com/owner/repo
+
+If the user mentions creating GitHub issues or fixes, extract the repo_url and set it in your response.
+If a full URL is not provided but a repository name is mentioned, construct the full URL.
+
+When the user asks to create a GitHub issue containing info for "recommendation X" (where X is a number), you MUST find the full text of that recommendation from the `conversation_history` (which is provided as `history_str`) and include it in the `issue_content` field of your JSON response. Pay close attention to the numbering of the recommendations in the `history_str`.
+
+Here are the available agents and their capabilities:
 
-    history_lines = []
-    for msg in conversation_history:
-        if isinstance(msg, HumanMessage):
-            history_lines.append(f"User: {msg.content}")
-        elif isinstance(msg, AIMessage):
-            history_lines.append(f"Agent: {msg.content}")
-    history_str = "\n".join(history_lines)
+- **log_explorer**: Answers questions about logs and explores potential issues.
+- **github_issue_manager**: Interacts with GitHub to create new issues and review & manage existing issues. Requires a 'repo_url'.
+- **solutions_agent**: Provides solutions or recommendations for issues.
 
-    prompt = f"""You are a supervisor agent. Your job is to analyze user requests and extract key information.
+Here are some examples of user queries and the information to extract:
 
-    IMPORTANT: Always extract the GitHub repository URL if mentioned in the query, regardless of what the user is asking to do.
-    The repo_url should be in the format: https://github.com/owner/repo
+**User Query:** "for cloud run service vllm-gemma-3-1b-it, can you tell if the performance has improved from yesterday's initial requests to today's?"
+**Response:** {"next_agent": "log_explorer"}
 
-    If the user mentions creating GitHub issues or fixes, extract the repo_url and set it in your response.
-    If a full URL is not provided but a repository name is mentioned, construct the full URL.
+**User Query:** "Review logs in region 'us-central1' and create fixes for any issues. The GitHub repository is: https://github.com/patelmm79/vllm-container-prewarm"
+**Response:** {"next_agent": "log_explorer", "repo_url": "https://github.com/patelmm79/vllm-container-prewarm"}
 
-    When the user asks to create a GitHub issue containing info for "recommendation X" (where X is a number), you MUST find the full text of that recommendation from the `conversation_history` (which is provided as `history_str`) and include it in the `issue_content` field of your JSON response. Pay close attention to the numbering of the recommendations in the `history_str`.
+**User Query:** "I need a solution for the high latency in my 'vllm-gemma' service."
+**Response:** {"next_agent": "solutions_agent"}
 
-    Here are the available agents and their capabilities:
+**User Query:** "please create a github issue to repository agentic-log-attacker, containing info for recommendation 6"
+**Response:** {"next_agent": "github_issue_manager", "repo_url": "https://github.com/patelmm79/agentic-log-attacker", "issue_content": "Consider CUDA Compilation Configuration: Explicitly setting `TORCH_CUDA_ARCH_LIST` (if the GPU architecture is known) could lead to slightly faster compilation and more optimized kernels."}
 
-    - **log_explorer**: Answers questions about logs and explores potential issues.
-    - **github_issue_manager**: Interacts with GitHub to create new issues and review & manage existing issues. Requires a 'repo_url'.
-    - **solutions_agent**: Provides solutions or recommendations for issues.
+**User Query:** "please create a github issue to repository vllm-container-prewarm, as a feature request to enable the \"Caching Compiled Kernels\" option"
+**Response:** {"next_agent": "github_issue_manager", "repo_url": "https://github.com/patelmm79/vllm-container-prewarm"}
 
-    Here are some examples of user queries and the information to extract:
+**User Query:** "Analyze the logs and create GitHub issues for problems in https://github.com/myuser/myrepo"
+**Response:** {"next_agent": "log_explorer", "repo_url": "https://github.com/myuser/myrepo"}
+"""
 
-    **User Query:** "for cloud run service vllm-gemma-3-1b-it, can you tell if the performance has improved from yesterday's initial requests to today's?"
-    **Response:** {{"next_agent": "log_explorer"}}
+# History line prefix per message type; other message types are left out of the history
+_ROLE_PREFIX = {HumanMessage: "User: ", AIMessage: "Agent: "}
 
-    **User Query:** "Review logs in region 'us-central1' and create fixes for any issues. The GitHub repository is: https://github.com/patelmm79/vllm-container-prewarm"
-    **Response:** {{"next_agent": "log_explorer", "repo_url": "https://github.com/patelmm79/vllm-container-prewarm"}}
+# Only the most recent messages are formatted into the prompt, so its length and the
+# formatting work stay bounded however long the conversation gets
+HISTORY_WINDOW_MESSAGES = 20
 
-    **User Query:** "I need a solution for the high latency in my 'vllm-gemma' service."
-    **Response:** {{"next_agent": "solutions_agent"}}
+# Routing decisions are reused for identical prompts for up to this long
+ROUTING_CACHE_MAX_AGE_SECONDS = 3600
 
-    **User Query:** "please create a github issue to repository agentic-log-attacker, containing info for recommendation 6"
-    **Response:** {{"next_agent": "github_issue_manager", "repo_url": "https://github.com/patelmm79/agentic-log-attacker", "issue_content": "Consider CUDA Compilation Configuration: Explicitly setting `TORCH_CUDA_ARCH_LIST` (if the GPU architecture is known) could lead to slightly faster compilation and more optimized kernels."}}
+# Routing decisions kept in memory, keyed by the normalized query and a digest of the
+# history window, so repeated or retried turns skip the prompt build and disk cache too
+ROUTING_MEMO_MAX_ENTRIES = 1024
+_routing_memo = OrderedDict()
+_routing_memo_lock = threading.Lock()
 
-    **User Query:** "please create a github issue to repository vllm-container-prewarm, as a feature request to enable the \"Caching Compiled Kernels\" option"
-    **Response:** {{"next_agent": "github_issue_manager", "repo_url": "https://github.com/patelmm79/vllm-container-prewarm"}}
+# Routing only emits a short JSON object, so it runs on the small router model with
+# deterministic, capped output. The cap still leaves room for a quoted issue_content.
+_ROUTER_GENERATION_CONFIG = {
+    "response_mime_type": "application/json",
+    "temperature": 0.0,
+    "max_output_tokens": 512,
+}
 
-    **User Query:** "Analyze the logs and create GitHub issues for problems in https://github.com/myuser/myrepo"
-    **Response:** {{"next_agent": "log_explorer", "repo_url": "https://github.com/myuser/myrepo"}}
+# Deterministic routes for unambiguous queries, checked before asking the model
+_GITHUB_REPO_URL = re.compile(r"https?://github\.com/([\w.-]+)/([\w-]+(?:\.[\w-]+)*)", re.IGNORECASE)
+_MENTIONS_GITHUB = re.compile(r"(?i)\b(github|repo|repository|issues?|pull request|pr)\b")
+_MENTIONS_SOLUTION = re.compile(r"(?i)\b(solutions?|recommend\w*|optimi[sz]\w*)\b")
+_MENTIONS_LOGS = re.compile(r"(?i)\blogs?\b")
 
-    The conversation history is:
-    {history_str}
+# Agents the supervisor can route to. Model output is mapped onto these shared string
+# objects once, so later comparisons and logs see one canonical spelling per route.
+_ROUTES = {name: name for name in ("log_explorer", "github_issue_manager", "solutions_agent")}
 
-    **User Query:** {user_query}
-    **Response:**
+# Per-call part of the prompt; only the history and query slots vary
+_SUPERVISOR_QUERY_TEMPLATE = """The conversation history is:
+{history}
+
+**User Query:** {query}
+**Response:**
+"""
+
+def _route_without_model(user_query: str):
+    """Routes queries whose destination is unambiguous without a model call.
+
+    Only explicit patterns are routed here: a log request (optionally naming a repository
+    URL) or a request for a solution that doesn't mention logs. Everything else, including
+    follow-ups and references to earlier messages such as "recommendation 6", returns None
+    so the model decides.
     """
+    if "recommendation" in user_query.lower():
+        return None
+    query_without_urls = _GITHUB_REPO_URL.sub("", user_query)
+    mentions_logs = _MENTIONS_LOGS.search(query_without_urls) is not None
+    mentions_solution = _MENTIONS_SOLUTION.search(query_without_urls) is not None
+
+    match = _GITHUB_REPO_URL.search(user_query)
+    if match:
+        # Log analysis that also names the repository to file issues in
+        if not mentions_logs or mentions_solution:
+            return None
+        next_agent = "log_explorer"
+        repo_url = f"https://github.com/{match.group(1)}/{match.group(2).removesuffix('.git')}"
+    elif _MENTIONS_GITHUB.search(query_without_urls) or mentions_logs == mentions_solution:
+        # GitHub requests without a URL, and queries asking for both or neither, are ambiguous
+        return None
+    elif mentions_solution:
+        next_agent = "solutions_agent"
+        repo_url = None
+    else:
+        next_agent = "log_explorer"
+        repo_url = None
 
-    model = genai.GenerativeModel(os.getenv("GEMINI_MODEL_NAME", "gemini-2.5-flash"))
-    response = model.generate_content(prompt)
-    response_text = response.text.strip()
+    return {"next_agent": next_agent, "repo_url": repo_url, "issue_content": None, "history": [f"Routing to {next_agent}"]}
+
+def _routing_key(user_query: str, history_str: str) -> tuple:
+    """Returns the routing memo key: the query with case and whitespace folded, and a history digest."""
+    query = " ".join(user_query.split()).lower()
+    return query, hashlib.blake2b(history_str.encode(), digest_size=16).digest()
+
+def _recall_route(key: tuple):
+    """Returns the memoized (next_agent, repo_url, issue_content) for key, or None."""
+    now = time.monotonic()
+    with _routing_memo_lock:
+        entry = _routing_memo.get(key)
+        if entry is None or entry[0] <= now:
+            return None
+        _routing_memo.move_to_end(key)
+        return entry[1]
+
+def _remember_route(key: tuple, decision: tuple):
+    """Memoizes a routing decision, evicting the least recently used entries beyond the limit."""
+    with _routing_memo_lock:
+        _routing_memo[key] = (time.monotonic() + ROUTING_CACHE_MAX_AGE_SECONDS, decision)
+        _routing_memo.move_to_end(key)
+        while len(_routing_memo) > ROUTING_MEMO_MAX_ENTRIES:
+            _routing_memo.popitem(last=False)
 
-    # Clean up any markdown formatting from the LLM response
-    if response_text.startswith('```json') and response_text.endswith('```'):
-        response_text = response_text[len('```json\n'):-len('\n```')]
+def supervisor_agent(user_query: str, conversation_history: list):
+    """A supervisor agent that routes requests to other agents using a few-shot prompting strategy."""
+
+    routed = _route_without_model(user_query)
+    if routed is not None:
+        return routed
+
+    recent_history = conversation_history[-HISTORY_WINDOW_MESSAGES:]
+    history_str = "\n".join([_ROLE_PREFIX[type(msg)] + msg.content for msg in recent_history if type(msg) in _ROLE_PREFIX])
+
+    key = _routing_key(user_query, history_str)
+    decision = _recall_route(key)
+    if decision is not None:
+        next_agent, repo_url, issue_content = decision
+        return {"next_agent": next_agent, "repo_url": repo_url, "issue_content": issue_content, "history": [f"Routing to {next_agent}"]}
+
+    prompt = _SUPERVISOR_QUERY_TEMPLATE.format(history=history_str, query=user_query)
+
+    # A repeated turn (same history and query) routes the same way, so reuse a recent decision
+    response_text = cached_generate(CONFIG.router_model, prompt, system_instruction=_SUPERVISOR_INSTRUCTIONS,
+                                    max_age=ROUTING_CACHE_MAX_AGE_SECONDS, generation_config=_ROUTER_GENERATION_CONFIG).strip()
 
+    repo_url = None
+    issue_content = None
     try:
-        parsed_response = json.loads(response_text)
+        # Skips any markdown fence around the JSON object
+        parsed_response = _parse_json_block(response_text)
+    except json.JSONDecodeError:
+        parsed_response = None
+
+    if isinstance(parsed_response, dict):
         next_agent = parsed_response.get("next_agent")
         repo_url = parsed_response.get("repo_url")
         issue_content = parsed_response.get("issue_content")
-    except json.JSONDecodeError:
-        # Fallback if LLM doesn't return valid JSON
+    else:
+        # Fallback if LLM doesn't return a JSON object
         next_agent = response_text # Assume it's just the agent name
-        repo_url = None
 
+    if isinstance(next_agent, str):
+        next_agent = _ROUTES.get(next_agent.strip().lower(), next_agent)
+
+    _remember_route(key, (next_agent, repo_url, issue_content))
     return {"next_agent": next_agent, "repo_url": repo_url, "issue_content": issue_content, "history": [f"Routing to {next_agent}"]}
@@ -9,15 +9,45 @@ Authentication is done via GitHub Personal Access Token (PAT).
 
 import os
 import json
+import orjson
+import time
+import hashlib
 import logging
+import itertools
+import tempfile
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 
 logger = logging.getLogger(__name__)
 
-
-@dataclass
+# Keep-alive connections held open to the MCP server, so concurrent tool calls
+# (e.g. from parallel graph nodes) reuse connections instead of opening new ones
+MAX_POOL_CONNECTIONS = 8
+
+# Transient MCP server failures are retried with exponential backoff, honoring Retry-After.
+# Only failures where the server cannot have run the call are retried: refused connections,
+# 429 and 503. Read errors, 500s and gateway errors (502/504) are not, since the upstream
+# may have run tools/call and already created an issue.
+MCP_RETRY = Retry(
+    total=3,
+    connect=3,
+    read=0,
+    backoff_factor=0.2,
+    status_forcelist=(429, 503),
+    allowed_methods=frozenset(["POST"]),
+    respect_retry_after_header=True,
+    raise_on_status=False,
+)
+
+# Tool lists are persisted here, per server URL, so short-lived runs skip tools/list
+TOOLS_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "agentic-log-attacker")
+TOOLS_CACHE_TTL_SECONDS = 24 * 60 * 60
+
+
+@dataclass(frozen=True, slots=True)
 class MCPTool:
     """Represents a tool available from the MCP server."""
     name: str
@@ -64,16 +94,20 @@ class GitHubMCPClient:
             "Content-Type": "application/json",
             "Accept": "application/json"
         })
+        adapter = HTTPAdapter(max_retries=MCP_RETRY, pool_connections=1, pool_maxsize=MAX_POOL_CONNECTIONS)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
 
-        self._request_id = 0
+        # itertools.count is safe to advance from several threads at once
+        self._request_ids = itertools.count(1)
         self._available_tools: Optional[List[MCPTool]] = None
+        self._protocol_version: Optional[str] = None
 
         logger.info(f"Initialized GitHub MCP client for server: {self.server_url}")
 
     def _next_request_id(self) -> int:
         """Generate the next request ID for JSON-RPC."""
-        self._request_id += 1
-        return self._request_id
+        return next(self._request_ids)
 
     def _make_jsonrpc_request(
         self,
@@ -107,12 +141,12 @@ class GitHubMCPClient:
         try:
             response = self.session.post(
                 self.server_url,
-                json=request_payload,
+                data=orjson.dumps(request_payload),
                 timeout=30
             )
             response.raise_for_status()
 
-            response_data = response.json()
+            response_data = orjson.loads(response.content)
 
             if "error" in response_data:
                 error = response_data["error"]
@@ -126,6 +160,9 @@ class GitHubMCPClient:
         except requests.RequestException as e:
             logger.error(f"Failed to connect to MCP server: {e}")
             raise Exception(f"MCP server connection failed: {e}")
+        except orjson.JSONDecodeError as e:
+            logger.error(f"Invalid JSON from MCP server: {e}")
+            raise Exception(f"MCP server returned invalid JSON: {e}")
 
     def initialize(self) -> Dict[str, Any]:
         """
@@ -153,9 +190,53 @@ class GitHubMCPClient:
             }
         )
 
+        self._protocol_version = result.get("protocolVersion")
         logger.info("MCP session initialized successfully")
         return result
 
+    def _tools_cache_path(self) -> str:
+        """Path of the on-disk tool list cache for this server."""
+        key = hashlib.sha1(self.server_url.encode()).hexdigest()
+        return os.path.join(TOOLS_CACHE_DIR, f"mcp_tools-{key}.json")
+
+    def _load_cached_tools(self) -> Optional[List[MCPTool]]:
+        """
+        Load the cached tool list for this server.
+
+        Returns:
+            The cached tools, or None if there is no entry, it has expired, or it was
+            written for a different protocol version than the current session's
+        """
+        try:
+            with open(self._tools_cache_path(), "r") as f:
+                cached = json.load(f)
+            if cached["expires"] < time.time():
+                return None
+            if self._protocol_version is not None and cached.get("protocol_version") != self._protocol_version:
+                return None
+            return [MCPTool(**tool_data) for tool_data in cached["tools"]]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _store_cached_tools(self, tools: List[MCPTool]):
+        """Atomically write the tool list cache for this server. Failures are logged and ignored."""
+        try:
+            os.makedirs(TOOLS_CACHE_DIR, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=TOOLS_CACHE_DIR, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump({
+                        "expires": time.time() + TOOLS_CACHE_TTL_SECONDS,
+                        "protocol_version": self._protocol_version,
+                        "tools": [asdict(tool) for tool in tools]
+                    }, f)
+                os.replace(tmp_path, self._tools_cache_path())
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            logger.warning(f"Could not write MCP tool cache: {e}")
+
     def list_tools(self) -> List[MCPTool]:
         """
         List all available tools from the MCP server.
@@ -177,6 +258,7 @@ class GitHubMCPClient:
             tools.append(tool)
 
         self._available_tools = tools
+        self._store_cached_tools(tools)
         logger.info(f"Found {len(tools)} available tools")
 
         return tools
@@ -224,11 +306,14 @@ class GitHubMCPClient:
         """
         Get the list of available tools (cached).
 
-        If tools haven't been fetched yet, this will fetch them.
+        If tools haven't been fetched yet, they are read from the on-disk cache when
+        it has an unexpired entry for this server, and fetched otherwise.
 
         Returns:
             List of available tools
         """
+        if self._available_tools is None:
+            self._available_tools = self._load_cached_tools()
         if self._available_tools is None:
             self.list_tools()
 
@@ -331,8 +416,8 @@ class GitHubMCPClient:
         # Parse the result if it's JSON text
         if isinstance(result, str):
             try:
-                return json.loads(result)
-            except json.JSONDecodeError:
+                return orjson.loads(result)
+            except orjson.JSONDecodeError:
                 return []
 
         return result if isinstance(result, list) else []
@@ -433,8 +518,8 @@ class GitHubMCPClient:
         # Parse the result if it's JSON text
         if isinstance(result, str):
             try:
-                return json.loads(result)
-            except json.JSONDecodeError:
+                return orjson.loads(result)
+            except orjson.JSONDecodeError:
                 return []
 
         return result if isinstance(result, list) else []
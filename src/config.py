@@ -0,0 +1,25 @@
+import os
+from dataclasses import dataclass
+from dotenv import load_dotenv
+
+# Agents and tools are imported before the entry points call load_dotenv(), so load .env here first
+load_dotenv()
+
+@dataclass(frozen=True, slots=True)
+class Config:
+    """Settings read from the environment once, at import time."""
+    github_token: str
+    gemini_model: str = "gemini-2.5-flash"
+    router_model: str = "gemini-2.5-flash-lite"
+    embedding_model: str = "models/gemini-embedding-001"
+    gcp_project: str = ""
+    gemini_api_key: str = ""
+
+CONFIG = Config(
+    github_token=os.environ.get("GITHUB_TOKEN", ""),
+    gemini_model=os.getenv("GEMINI_MODEL_NAME", "gemini-2.5-flash"),
+    router_model=os.getenv("GEMINI_ROUTER_MODEL", "gemini-2.5-flash-lite"),
+    embedding_model=os.getenv("GEMINI_EMBEDDING_MODEL", "models/gemini-embedding-001"),
+    gcp_project=os.environ.get("GOOGLE_CLOUD_PROJECT", ""),
+    gemini_api_key=os.environ.get("GEMINI_API_KEY", ""),
+)
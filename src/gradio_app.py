@@ -1,46 +1,68 @@
 import os
-import sys
+import logging
+import functools
 import gradio as gr
 import uuid
 from langchain_core.messages import HumanMessage
 
-from src.main import app
-from src.tools.conversation_logger import log_conversation
-
 # Load environment variables
 from dotenv import load_dotenv
 load_dotenv()
 
-def chat_session(message: str, history: list, thread_id: str):
-    """Manages a single chat session, maintaining state between turns."""
-    print("--- chat_session called ---")
-    print(f"Message: {message}")
-    print(f"Thread ID: {thread_id}")
+logger = logging.getLogger(__name__)
 
-    if thread_id is None:
-        thread_id = str(uuid.uuid4())
-        print(f"New Thread ID: {thread_id}")
+# Chat turns processed at once. Gradio runs one submit at a time by default, which
+# would queue every other user behind a multi-second workflow run.
+MAX_CONCURRENT_TURNS = 8
 
-    # Invoke the agentic workflow
-    response = app.invoke(
-        {"messages": [HumanMessage(content=message)]},
-        {"configurable": {"thread_id": thread_id}}
-    )
-    print(f"Response from app.invoke: {response}")
+@functools.lru_cache(maxsize=1)
+def _workflow():
+    """Imports the compiled workflow on the first chat turn, so the UI starts without building the graph."""
+    from src.main import full_workflow
+    return full_workflow
 
-    # Get the latest response from the agent
+def _final_message(response: dict) -> str:
+    """Picks the message to show for a finished workflow run."""
     next_agent = response.get('next_agent')
     if next_agent == "github_issue_manager" and 'github_issue_manager_history' in response and response['github_issue_manager_history']:
-        bot_message = response['github_issue_manager_history'][-1]
+        return response['github_issue_manager_history'][-1]
     elif 'suggested_fix' in response and response['suggested_fix']:
-        bot_message = response['suggested_fix']
+        return response['suggested_fix']
     elif 'orchestrator_history' in response and response['orchestrator_history']:
-        bot_message = response['orchestrator_history'][-1]
-    else:
-        bot_message = "I'm sorry, I couldn't process that request."
-    print(f"Final bot_message before returning: {bot_message}")
+        return response['orchestrator_history'][-1]
+    return "I'm sorry, I couldn't process that request."
+
+def chat_session(message: str, history: list, thread_id: str):
+    """Manages a single chat session, maintaining state between turns.
+
+    Yields (bot_message, thread_id) pairs: the answer so far while agents stream it,
+    then the final message once the workflow has finished.
+    """
+    logger.debug("--- chat_session called ---")
+    logger.debug("Message: %r", message)
+    logger.debug("Thread ID: %s", thread_id)
+
+    if thread_id is None:
+        thread_id = str(uuid.uuid4())
+        logger.debug("New Thread ID: %s", thread_id)
+
+    # Run the agentic workflow, receiving answer chunks ("custom") as well as state snapshots
+    response = {}
+    partial = ""
+    for mode, chunk in _workflow().stream(
+        {"messages": [HumanMessage(content=message)]},
+        {"configurable": {"thread_id": thread_id}},
+        stream_mode=["custom", "values"],
+    ):
+        if mode == "custom":
+            partial += chunk
+            yield partial, thread_id
+        else:
+            response = chunk
 
-    return bot_message, thread_id
+    bot_message = _final_message(response)
+    logger.debug("Final bot_message before returning: %r", bot_message)
+    yield bot_message, thread_id
 
 with gr.Blocks() as demo:
     # The state object to hold the thread_id across calls
@@ -55,19 +77,19 @@ with gr.Blocks() as demo:
         txt = gr.Textbox(show_label=False, placeholder="Enter your message...")
 
     def on_submit(message, history, state):
-        print("--- on_submit called ---")
-        print(f"Message: {message}")
-        print(f"History: {history}")
-        print(f"State: {state}")
+        logger.debug("--- on_submit called ---")
+        logger.debug("Message: %r", message)
+        logger.debug("State: %r", state)
         thread_id = state["thread_id"]
-        bot_response, new_thread_id = chat_session(message, history, thread_id)
-        print(f"Bot Response from chat_session: {bot_response}")
-        print(f"New Thread ID from chat_session: {new_thread_id}")
-        updated_history = history + [(message, bot_response)]
-        print(f"Updated History before returning: {updated_history}")
-        return updated_history, {"thread_id": new_thread_id}, ""
+        # Re-render the chat as each chunk arrives so the answer appears while it is generated
+        for bot_response, new_thread_id in chat_session(message, history, thread_id):
+            updated_history = history + [(message, bot_response)]
+            yield updated_history, {"thread_id": new_thread_id}, ""
 
-    txt.submit(on_submit, [txt, chatbot, state], [chatbot, state, txt])
+    txt.submit(on_submit, [txt, chatbot, state], [chatbot, state, txt], queue=True, concurrency_limit=MAX_CONCURRENT_TURNS)
 
 if __name__ == "__main__":
+    # src.main configures the root logger from LOG_LEVEL once the workflow is first loaded;
+    # apply the level now so messages logged before then follow it too
+    logging.getLogger().setLevel(os.environ.get("LOG_LEVEL", "INFO").upper())
     demo.launch(share=True)
\ No newline at end of file
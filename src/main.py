@@ -1,20 +1,24 @@
 import os
 import sys
+import asyncio
 import re
 import logging
 import uuid
 import time
 from datetime import datetime
-from dotenv import load_dotenv
 from typing import TypedDict, Annotated
 import operator
+import threading
+from collections import OrderedDict
+import orjson
 from langgraph.graph import StateGraph, END
-import google.generativeai as genai
+from langgraph.config import get_stream_writer
 from langgraph.checkpoint.memory import InMemorySaver
 from langchain_core.messages import AnyMessage, HumanMessage
-from fastapi import FastAPI, Request, Depends, HTTPException
-from pydantic import BaseModel
+from fastapi import FastAPI, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 
+from src.config import CONFIG
 from src.agents.log_explorer import log_explorer_agent
 from src.agents.issue_creation_agent import issue_creation_agent, Issue
 from src.agents.github_issue_manager import github_issue_manager_agent
@@ -24,27 +28,37 @@ from src.agents.solutions_agent import solutions_agent
 from src.models.a2a_models import A2ARequest, A2AResponse
 from src.middleware.a2a_auth import authenticator
 from src.middleware.rate_limiter import rate_limiter
+from src.tools.cache import ttl_cache
 
-# Load environment variables
-load_dotenv()
-
-# Configure logging
-logging.basicConfig(level=logging.INFO, stream=sys.stdout, format='%(asctime)s - %(levelname)s - %(message)s')
+# Configure logging. Node traces are logged at DEBUG; set LOG_LEVEL=DEBUG to see them.
+logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO").upper(), stream=sys.stdout, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-logger.info(f"GOOGLE_APPLICATION_CREDENTIALS: {os.environ.get('GOOGLE_APPLICATION_CREDENTIALS')}")
-logger.info(f"CLOUD_RUN_REGION: {os.environ.get('CLOUD_RUN_REGION')}")
-logger.info(f"GOOGLE_CLOUD_PROJECT: {os.environ.get('GOOGLE_CLOUD_PROJECT')}")
-logger.info(f"GEMINI_MODEL_NAME: {os.environ.get('GEMINI_MODEL_NAME')}")
-
-# Configure the generative AI model
-gemini_api_key = os.environ.get("GEMINI_API_KEY")
-if not gemini_api_key:
-    logger.error("GEMINI_API_KEY environment variable is not set. The application will not function properly.")
-    # Don't crash on startup, but the API won't work without it
-else:
-    genai.configure(api_key=gemini_api_key)
-    logger.info("Gemini API configured successfully")
+# Service type and name patterns for queries that don't pass service_name, compiled once.
+# Pattern explanation: [a-zA-Z0-9._-]+ matches alphanumeric, dots, underscores, and hyphens
+# (?:['\"]|\s|,|$) ensures the name ends with a quote, whitespace, comma, or end of string
+# This prevents partial matches like "my" from "my@invalid"
+# This aligns with GCP naming conventions and our sanitization function
+_SERVICE_PATTERNS = [
+    (re.compile(pattern, re.IGNORECASE), svc_type) for pattern, svc_type in (
+        (r"cloud run service\s+['\"]?([a-zA-Z0-9._-]+)(?:['\"]|\s|,|$)", "cloud_run"),
+        (r"cloud build\s+(?:logs for\s+)?['\"]?([a-zA-Z0-9._-]+)(?:['\"]|\s|,|$)", "cloud_build"),
+        (r"cloud function\s+['\"]?([a-zA-Z0-9._-]+)(?:['\"]|\s|,|$)", "cloud_functions"),
+        (r"gce instance\s+['\"]?([a-zA-Z0-9._-]+)(?:['\"]|\s|,|$)", "gce"),
+        (r"gke cluster\s+['\"]?([a-zA-Z0-9._-]+)(?:['\"]|\s|,|$)", "gke"),
+        (r"app engine\s+['\"]?([a-zA-Z0-9._-]+)(?:['\"]|\s|,|$)", "app_engine"),
+    )
+]
+_VALID_SERVICE_NAME = re.compile(r'^[a-zA-Z0-9._-]+$')
+_GITHUB_URL = re.compile(r'https://github\.com/[^\s]+')
+
+# Greetings and acknowledgements that need no log analysis, answered without any model call
+_TRIVIAL_QUERIES = frozenset({"hi", "hello", "hey", "thanks", "thank you", "ok", "okay", "help"})
+MIN_QUERY_LENGTH = 4
+_USAGE_REPLY = (
+    "Ask me about the logs of a GCP service, e.g. 'for cloud run service my-service, what errors happened today?'. "
+    "Include a GitHub repository URL to have issues created for the problems found."
+)
 
 class AgentState(TypedDict):
     """Defines the state of the agentic workflow."""
@@ -65,46 +79,39 @@ def supervisor_node(state: AgentState):
 
     This node is responsible for coordinating the work of the other agents.
     """
-    logger.info("--- Supervisor Node ---")
+    logger.debug("--- Supervisor Node ---")
     user_query = state['messages'][-1].content
     conversation_history = state['messages']
 
+    # Only an opening message can be trivial; mid-conversation "why?" or "more" is a follow-up
+    first_turn = len(conversation_history) <= 1 and not state.get('orchestrator_history') and not state.get('log_reviewer_history')
+    normalized_query = user_query.strip().strip("!.?").lower()
+    if first_turn and (len(normalized_query) < MIN_QUERY_LENGTH or normalized_query in _TRIVIAL_QUERIES):
+        logger.debug("Trivial query, replying with usage instead of running the agents")
+        return {"next_agent": "END", "orchestrator_history": [_USAGE_REPLY]}
+
     # Get service name and type from state (passed from API request)
     service_name = state.get("service_name")
     service_type = state.get("service_type", "cloud_run")  # Default to cloud_run
 
     # If not provided in state, attempt to extract from the user query as fallback
     if not service_name:
-        # Try to match service type and name patterns
-        # Pattern explanation: [a-zA-Z0-9._-]+ matches alphanumeric, dots, underscores, and hyphens
-        # (?:['\"]|\s|,|$) ensures the name ends with a quote, whitespace, comma, or end of string
-        # This prevents partial matches like "my" from "my@invalid"
-        # This aligns with GCP naming conventions and our sanitization function
-        service_patterns = [
-            (r"cloud run service\s+['\"]?([a-zA-Z0-9._-]+)(?:['\"]|\s|,|$)", "cloud_run"),
-            (r"cloud build\s+(?:logs for\s+)?['\"]?([a-zA-Z0-9._-]+)(?:['\"]|\s|,|$)", "cloud_build"),
-            (r"cloud function\s+['\"]?([a-zA-Z0-9._-]+)(?:['\"]|\s|,|$)", "cloud_functions"),
-            (r"gce instance\s+['\"]?([a-zA-Z0-9._-]+)(?:['\"]|\s|,|$)", "gce"),
-            (r"gke cluster\s+['\"]?([a-zA-Z0-9._-]+)(?:['\"]|\s|,|$)", "gke"),
-            (r"app engine\s+['\"]?([a-zA-Z0-9._-]+)(?:['\"]|\s|,|$)", "app_engine"),
-        ]
-
-        for pattern, svc_type in service_patterns:
-            match = re.search(pattern, user_query, re.IGNORECASE)
+        for pattern, svc_type in _SERVICE_PATTERNS:
+            match = pattern.search(user_query)
             if match:
                 service_name = match.group(1)
                 service_type = svc_type
 
                 # Validate extracted service name matches expected format
                 # This provides defense-in-depth before the sanitization step
-                if not re.match(r'^[a-zA-Z0-9._-]+$', service_name):
+                if not _VALID_SERVICE_NAME.match(service_name):
                     logger.warning(
                         f"Extracted potentially invalid service name: '{service_name}'. "
                         f"Service names should only contain alphanumeric characters, dots, underscores, and hyphens."
                     )
                     continue  # Try next pattern
 
-                logger.info(f"Extracted service name '{service_name}' and type '{service_type}' from query")
+                logger.debug("Extracted service name '%s' and type '%s' from query", service_name, service_type)
                 break
 
         if not service_name:
@@ -112,12 +119,13 @@ def supervisor_node(state: AgentState):
             logger.error(error_msg)
             return {
                 "messages": [HumanMessage(content=error_msg)],
+                "orchestrator_history": [error_msg],
                 "next_agent": "END",
                 "service_name": None,
                 "service_type": "cloud_run"
             }
     else:
-        logger.info(f"Using service name '{service_name}' and type '{service_type}' from request")
+        logger.debug("Using service name '%s' and type '%s' from request", service_name, service_type)
 
     response = supervisor_agent(user_query=user_query, conversation_history=conversation_history)
 
@@ -126,9 +134,9 @@ def supervisor_node(state: AgentState):
     repo_url = response.get("repo_url")
     issue_content = response.get("issue_content") # Initialize issue_content here
 
-    logger.info(f"Supervisor Agent decided next_agent: {next_agent}")
+    logger.info("Supervisor Agent decided next_agent: %s", next_agent)
     if repo_url:
-        logger.info(f"Supervisor Agent extracted repo_url: {repo_url}")
+        logger.info("Supervisor Agent extracted repo_url: %s", repo_url)
 
     # Return updates to the state
     updates = {
@@ -143,38 +151,45 @@ def supervisor_node(state: AgentState):
 
 def log_explorer_node(state: AgentState):
     """Answers questions about logs and explores potential issues."""
-    logger.info("--- Log Explorer Node ---")
+    logger.debug("--- Log Explorer Node ---")
     service_name = state.get('service_name')
     service_type = state.get('service_type', 'cloud_run')
     user_query = state['messages'][-1].content
 
-    logger.info(f"Service Name: {service_name}")
-    logger.info(f"Service Type: {service_type}")
-    logger.info(f"User Query: {user_query}")
+    logger.debug("Service Name: %s", service_name)
+    logger.debug("Service Type: %s", service_type)
+    logger.debug("User Query: %s", user_query)
 
     result = log_explorer_agent(
         service_name=service_name,
         service_type=service_type,
         user_query=user_query,
-        conversation_history=state['messages']
+        conversation_history=state['messages'],
+        # Forwards answer chunks to callers streaming with stream_mode="custom"
+        on_chunk=get_stream_writer()
     )
 
-    return {"log_reviewer_history": [result], "orchestrator_history": state['orchestrator_history'] + [result]}
+    return {"log_reviewer_history": [result], "orchestrator_history": [result]}
+
+# The same service analyzed again within a minute (e.g. a retried A2A call) reuses the
+# issues found; runs that found nothing are cheap and not cached
+ISSUE_CREATION_CACHE_TTL_SECONDS = 60
+_cached_issue_creation = ttl_cache(maxsize=256, ttl=ISSUE_CREATION_CACHE_TTL_SECONDS, should_cache=bool)(issue_creation_agent)
 
 def issue_creation_node(state: AgentState):
     """Analyzes log files and generates issues in every case."""
-    logger.info("--- Issue Creation Node ---")
+    logger.debug("--- Issue Creation Node ---")
     service_name = state.get('service_name')
     repo_url = state.get('git_repo_url')
 
-    logger.info(f"Service name: {service_name}")
-    logger.info(f"Repo URL: {repo_url}")
+    logger.debug("Service name: %s", service_name)
+    logger.debug("Repo URL: %s", repo_url)
 
-    issues = issue_creation_agent(service_name=service_name, repo_url=repo_url)
-    logger.info(f"Issue creation agent returned {len(issues)} issues")
+    issues = _cached_issue_creation(service_name=service_name, repo_url=repo_url, service_type=state.get('service_type', 'cloud_run'))
+    logger.info("Issue creation agent returned %s issues", len(issues))
     if issues:
         for i, issue in enumerate(issues):
-            logger.info(f"Issue {i+1}: {issue.description} (Priority: {issue.priority})")
+            logger.debug("Issue %s: %s (Priority: %s)", i+1, issue.description, issue.priority)
     else:
         logger.warning("No issues were created by issue_creation_agent")
 
@@ -182,27 +197,27 @@ def issue_creation_node(state: AgentState):
 
 def github_issue_manager_node(state: AgentState):
     """Creates GitHub issues for the identified issues."""
-    logger.info("--- GitHub Issue Manager Node ---")
+    logger.debug("--- GitHub Issue Manager Node ---")
     issues_to_create = state.get('issues', [])
     issue_content = state.get('issue_content')
     suggested_fix = state.get('suggested_fix')
     repo_url = state.get('git_repo_url')
 
-    logger.info(f"Issues from state: {len(issues_to_create)}")
-    logger.info(f"Repo URL: {repo_url}")
-    logger.info(f"Issue content: {issue_content}")
+    logger.debug("Issues from state: %s", len(issues_to_create))
+    logger.debug("Repo URL: %s", repo_url)
+    logger.debug("Issue content: %s", issue_content)
 
     if issue_content and suggested_fix and not issues_to_create:
         # If issue_content and suggested_fix are present, use them to create the issue
         # issue_content will be the title/short description, suggested_fix will be the body
         new_issue = Issue(description=issue_content, priority="Medium", log_entries=[suggested_fix])
         issues_to_create = [new_issue]
-        logger.info("Created issue from issue_content and suggested_fix")
+        logger.debug("Created issue from issue_content and suggested_fix")
     elif issue_content and not issues_to_create:
         # Fallback if only issue_content is present
         new_issue = Issue(description=issue_content, priority="Medium", log_entries=[])
         issues_to_create = [new_issue]
-        logger.info("Created issue from issue_content only")
+        logger.debug("Created issue from issue_content only")
 
     if not issues_to_create:
         logger.warning("No issues to create!")
@@ -212,14 +227,14 @@ def github_issue_manager_node(state: AgentState):
         logger.error("No repo_url provided!")
         return {"github_issue_manager_history": ["Error: No repository URL provided"]}
 
-    logger.info(f"Calling github_issue_manager_agent with {len(issues_to_create)} issues")
+    logger.debug("Calling github_issue_manager_agent with %s issues", len(issues_to_create))
     history = github_issue_manager_agent(issues=issues_to_create, repo_url=repo_url, user_query=state['messages'][-1].content)
-    logger.info(f"GitHub issue manager result: {history}")
+    logger.debug("GitHub issue manager result: %s", history)
     return {"github_issue_manager_history": history['github_issue_manager_history']}
 
 def code_fixer_node(state: AgentState):
     """Suggests and applies a code fix for the identified issues."""
-    logger.info("Code fixer agent is running")
+    logger.debug("Code fixer agent is running")
     # For now, just take the first issue
     # In the future, we can iterate over all issues
     if state.get('issues'):
@@ -229,73 +244,108 @@ def code_fixer_node(state: AgentState):
 
 def solutions_node(state: AgentState):
     """Provides a solution for the identified issues."""
-    logger.info("--- Entering Solutions Node ---")
-    logger.info(f"Issues in state: {state.get('issues')}")
+    logger.debug("--- Entering Solutions Node ---")
+    logger.debug("Issues in state: %s", state.get('issues'))
     service_name = state.get('service_name')
     # Pass the first issue if available, otherwise an empty dict
     issue_to_process = state['issues'][0] if state.get('issues') else {}
-    solution = solutions_agent(issue=issue_to_process, user_query=state['messages'][-1].content, service_name=service_name)
-    logger.info(f"Solutions agent returned: {solution}")
+    solution = solutions_agent(issue=issue_to_process, user_query=state['messages'][-1].content, service_name=service_name,
+                               on_chunk=get_stream_writer(), conversation_history=state['messages'])
+    logger.debug("Solutions agent returned: %s", solution)
     return {"suggested_fix": solution}
 
 def ask_for_repo_url_node(state: AgentState):
     """Asks the user for the GitHub repository URL."""
-    logger.info("--- Ask for Repo URL Node ---")
+    logger.debug("--- Ask for Repo URL Node ---")
     return {"orchestrator_history": ["Please provide the full GitHub repository URL (e.g., https://github.com/owner/repo)."]}
 
-# Define the graph
-workflow = StateGraph(AgentState)
-
-# Add the nodes
-workflow.add_node("supervisor", supervisor_node)
-workflow.add_node("log_explorer", log_explorer_node)
-workflow.add_node("issue_creation", issue_creation_node)
-workflow.add_node("github_issue_manager", github_issue_manager_node)
-workflow.add_node("code_fixer", code_fixer_node)
-workflow.add_node("solutions", solutions_node)
-workflow.add_node("ask_for_repo_url", ask_for_repo_url_node)
-
-def route_after_log_explorer(state: AgentState):
-    """Determines if we should create issues after exploring logs."""
-    logger.info("--- Routing after log_explorer ---")
+def route_after_supervisor(state: AgentState):
+    """Determines which agents run after the supervisor.
+
+    Issue creation does not depend on the log explorer's answer, so when a repo URL is
+    set both run in the same step and their Gemini calls overlap instead of running
+    back to back.
+    """
+    logger.debug("--- Routing after supervisor ---")
+    if state.get('next_agent') == "END":
+        # The supervisor already answered (e.g. a greeting, or no service name to look at)
+        return [END]
     # Check if user wants to create GitHub issues (repo_url is set)
     if state.get('git_repo_url'):
-        logger.info("Repo URL found, routing to issue_creation")
-        return "issue_creation"
+        logger.debug("Repo URL found, running log_explorer and issue_creation in parallel")
+        return ["log_explorer", "issue_creation"]
     else:
-        logger.info("No repo URL, ending workflow")
-        return "end"
-
-workflow.set_entry_point("supervisor")
-workflow.add_edge("supervisor", "log_explorer")
-
-# After log_explorer, conditionally go to issue_creation if repo_url is provided
-workflow.add_conditional_edges(
-    "log_explorer",
-    route_after_log_explorer,
-    {
-        "issue_creation": "issue_creation",
-        "end": END
-    }
-)
+        logger.debug("No repo URL, running log_explorer only")
+        return ["log_explorer"]
 
-# After issue_creation, go to github_issue_manager to create GitHub issues
-workflow.add_edge("issue_creation", "github_issue_manager")
+def build_workflow(checkpointer=None):
+    """Assembles the agent graph and compiles it with the given checkpointer.
 
-# Terminal nodes
-workflow.add_edge("github_issue_manager", END)
-workflow.add_edge("code_fixer", END)
-workflow.add_edge("solutions", END)
-workflow.add_edge("ask_for_repo_url", END)
+    The module compiles it once, as full_workflow; the FastAPI app and the Gradio UI share that instance.
+    """
+    workflow = StateGraph(AgentState)
+
+    # Add the nodes
+    workflow.add_node("supervisor", supervisor_node)
+    workflow.add_node("log_explorer", log_explorer_node)
+    workflow.add_node("issue_creation", issue_creation_node)
+    workflow.add_node("github_issue_manager", github_issue_manager_node)
+    workflow.add_node("code_fixer", code_fixer_node)
+    workflow.add_node("solutions", solutions_node)
+    workflow.add_node("ask_for_repo_url", ask_for_repo_url_node)
+
+    workflow.set_entry_point("supervisor")
+    workflow.add_conditional_edges("supervisor", route_after_supervisor, ["log_explorer", "issue_creation", END])
+
+    # After issue_creation, go to github_issue_manager to create GitHub issues
+    workflow.add_edge("issue_creation", "github_issue_manager")
+
+    # Terminal nodes
+    workflow.add_edge("log_explorer", END)
+    workflow.add_edge("github_issue_manager", END)
+    workflow.add_edge("code_fixer", END)
+    workflow.add_edge("solutions", END)
+    workflow.add_edge("ask_for_repo_url", END)
 
+    return workflow.compile(checkpointer=checkpointer)
 
+# Conversations whose checkpoints are kept in memory; older ones are forgotten
+MAX_CHECKPOINT_THREADS = 256
 
+class BoundedInMemorySaver(InMemorySaver):
+    """InMemorySaver that keeps only the max_threads most recently written threads.
 
+    Gradio sessions never end explicitly, so without a bound every conversation's
+    state would stay in memory for the life of the process.
+    """
+
+    def __init__(self, max_threads: int = MAX_CHECKPOINT_THREADS, **kwargs):
+        super().__init__(**kwargs)
+        self.max_threads = max_threads
+        self._recent_threads = OrderedDict()
+        self._recent_lock = threading.Lock()
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        result = super().put(config, checkpoint, metadata, new_versions)
+        with self._recent_lock:
+            self._recent_threads[config["configurable"]["thread_id"]] = None
+            self._recent_threads.move_to_end(config["configurable"]["thread_id"])
+            evicted = []
+            while len(self._recent_threads) > self.max_threads:
+                evicted.append(self._recent_threads.popitem(last=False)[0])
+        for thread_id in evicted:
+            super().delete_thread(thread_id)
+        return result
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._recent_lock:
+            self._recent_threads.pop(thread_id, None)
+        super().delete_thread(thread_id)
 
 # Compile the graph
-memory = InMemorySaver()
+memory = BoundedInMemorySaver()
 
-full_workflow = workflow.compile(checkpointer=memory)
+full_workflow = build_workflow(memory)
 
 app = FastAPI()
 
@@ -303,6 +353,13 @@ app = FastAPI()
 async def startup_event():
     logger.info("=" * 50)
     logger.info("FastAPI application starting up (A2A Integration v2.0)...")
+    logger.info(f"GOOGLE_APPLICATION_CREDENTIALS: {os.environ.get('GOOGLE_APPLICATION_CREDENTIALS')}")
+    logger.info(f"CLOUD_RUN_REGION: {os.environ.get('CLOUD_RUN_REGION')}")
+    logger.info(f"GOOGLE_CLOUD_PROJECT: {os.environ.get('GOOGLE_CLOUD_PROJECT')}")
+    logger.info(f"GEMINI_MODEL_NAME: {os.environ.get('GEMINI_MODEL_NAME')}")
+    if not CONFIG.gemini_api_key:
+        # Don't crash on startup, but the API won't work without it
+        logger.error("GEMINI_API_KEY environment variable is not set. The application will not function properly.")
     logger.info(f"PORT environment variable: {os.environ.get('PORT', '8080')}")
     logger.info("A2A A2A Skill: analyze_and_monitor_logs")
     logger.info("Application is ready to receive A2A requests from dev-nexus")
@@ -313,9 +370,10 @@ async def startup_event():
 @app.get("/")
 async def health_check():
     """Health check endpoint for A2A compatibility."""
-    gemini_configured = bool(os.getenv("GEMINI_API_KEY"))
-    gcp_project = os.getenv("GOOGLE_CLOUD_PROJECT")
-    github_token = bool(os.getenv("GITHUB_TOKEN"))
+    # Settings are read once at startup rather than on every probe
+    gemini_configured = bool(CONFIG.gemini_api_key)
+    gcp_project = CONFIG.gcp_project or None
+    github_token = bool(CONFIG.github_token)
 
     status = "healthy" if (gemini_configured and gcp_project and github_token) else "degraded"
 
@@ -355,6 +413,7 @@ async def agent_metadata():
         ],
         "endpoints": {
             "execute": "/a2a/execute",
+            "execute_stream": "/a2a/execute/stream",
             "health": "/health"
         },
         "skills": [
@@ -422,7 +481,7 @@ async def agent_metadata():
     }
 
 
-@app.post("/a2a/execute")
+@app.post("/a2a/execute", response_model=A2AResponse)
 async def a2a_execute(
     request: A2ARequest,
     caller: str = Depends(authenticator.verify_token)
@@ -467,10 +526,18 @@ async def a2a_execute(
 
         thread_id = str(uuid.uuid4())
 
-        result = full_workflow.invoke(
-            initial_state,
-            config={"configurable": {"thread_id": thread_id}}
-        )
+        # The agents make blocking Gemini, GCP and GitHub calls; run the graph in a
+        # worker thread so the event loop keeps serving other requests meanwhile
+        try:
+            result = await asyncio.to_thread(
+                full_workflow.invoke,
+                initial_state,
+                config={"configurable": {"thread_id": thread_id}}
+            )
+        finally:
+            # Each A2A call uses a fresh thread that is never resumed, so drop its
+            # checkpoints rather than keeping every run's state in memory
+            memory.delete_thread(thread_id)
 
         # Format response for A2A
         execution_time = int((time.time() - start_time) * 1000)
@@ -481,7 +548,7 @@ async def a2a_execute(
             for history_item in result['github_issue_manager_history']:
                 if isinstance(history_item, str) and 'https://github.com' in history_item:
                     # Extract URLs from history text
-                    urls = re.findall(r'https://github\.com/[^\s]+', history_item)
+                    urls = _GITHUB_URL.findall(history_item)
                     github_issues.extend(urls)
 
         analysis_text = None
@@ -517,4 +584,65 @@ async def a2a_execute(
             success=False,
             error=str(e),
             execution_time_ms=execution_time
-        )
\ No newline at end of file
+        )
+
+
+def _jsonable(value):
+    """orjson fallback for state values: pydantic models (issues, messages) and anything else as text."""
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    return str(value)
+
+
+@app.post("/a2a/execute/stream")
+async def a2a_execute_stream(
+    request: A2ARequest,
+    caller: str = Depends(authenticator.verify_token)
+):
+    """
+    Execute the analyze_and_monitor_logs skill, streaming progress as NDJSON.
+
+    Each line is either {"type": "chunk", "text": ...} for a piece of an agent's answer,
+    or {"type": "update", "node": ..., "data": ...} for the state a node produced.
+    """
+    await rate_limiter.check_rate_limit(caller)
+
+    if request.skill_id != "analyze_and_monitor_logs":
+        raise HTTPException(
+            status_code=404,
+            detail=f"Skill '{request.skill_id}' not found. Available skills: analyze_and_monitor_logs"
+        )
+    user_query = request.input.get("user_query")
+    if not user_query:
+        raise HTTPException(status_code=400, detail="user_query is required")
+
+    logger.info(f"[A2A] Streaming workflow: caller={caller}, query_length={len(user_query)}")
+
+    initial_state = {
+        "messages": [HumanMessage(content=user_query)],
+        "service_name": request.input.get("service_name"),
+        "service_type": request.input.get("service_type", "cloud_run"),
+        "git_repo_url": request.input.get("repo_url")
+    }
+    thread_id = str(uuid.uuid4())
+
+    def lines():
+        # A sync generator: Starlette advances it in a worker thread, like the blocking invoke above
+        try:
+            for mode, chunk in full_workflow.stream(
+                initial_state,
+                config={"configurable": {"thread_id": thread_id}},
+                stream_mode=["custom", "updates"],
+            ):
+                if mode == "custom":
+                    yield orjson.dumps({"type": "chunk", "text": chunk}) + b"\n"
+                else:
+                    for node, data in chunk.items():
+                        yield orjson.dumps({"type": "update", "node": node, "data": data}, default=_jsonable) + b"\n"
+        except Exception as e:
+            logger.error(f"[A2A] Streaming workflow failed: {e}", exc_info=True)
+            yield orjson.dumps({"type": "error", "error": str(e)}) + b"\n"
+        finally:
+            memory.delete_thread(thread_id)
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
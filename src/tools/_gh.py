@@ -0,0 +1,12 @@
+import functools
+from github import Github
+
+@functools.lru_cache(maxsize=16)
+def _get_client(token: str):
+    """Returns a PyGithub client per token. Listings fetch 100 items per page instead of the default 30."""
+    return Github(token, per_page=100)
+
+@functools.lru_cache(maxsize=16)
+def _get_repo(token: str, repo_name: str):
+    """Returns the PyGithub repository object, resolving it once per (token, repo_name)."""
+    return _get_client(token).get_repo(repo_name)
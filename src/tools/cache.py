@@ -0,0 +1,67 @@
+import time
+import functools
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from src.tools.gcp_logging_tool import get_gcp_logs
+from src.tools.github_tool import get_github_issues
+
+def ttl_cache(maxsize: int = 128, ttl: float = 30.0, should_cache=None):
+    """Memoizes a function's results for ttl seconds, keeping at most maxsize entries.
+
+    Results for which should_cache(result) is false (e.g. errors) are returned but not stored.
+    Concurrent calls with the same arguments (e.g. from parallel graph nodes) wait for the
+    first one's result instead of calling func again.
+    Cached results are shared between callers, so they must not be mutated.
+    The wrapper's cache_clear() drops every entry.
+    """
+    def decorator(func):
+        entries = OrderedDict()
+        in_flight = {}
+        lock = threading.Lock()
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+            with lock:
+                entry = entries.get(key)
+                if entry is not None and entry[0] > now:
+                    return entry[1]
+                pending = in_flight.get(key)
+                if pending is None:
+                    in_flight[key] = owned = Future()
+            if pending is not None:
+                return pending.result()
+
+            try:
+                result = func(*args, **kwargs)
+            except BaseException as e:
+                with lock:
+                    del in_flight[key]
+                owned.set_exception(e)
+                raise
+            with lock:
+                del in_flight[key]
+                if should_cache is None or should_cache(result):
+                    entries[key] = (now + ttl, result)
+                    entries.move_to_end(key)
+                    while len(entries) > maxsize:
+                        entries.popitem(last=False)
+            owned.set_result(result)
+            return result
+
+        def cache_clear():
+            with lock:
+                entries.clear()
+
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator
+
+# Agents invoked back to back in one session ask for the same logs; errors are never cached
+_cached_get_gcp_logs = ttl_cache(should_cache=lambda result: result[2] is None)(get_gcp_logs)
+
+# get_github_issues returns [] on failure, so empty results are refetched
+_cached_get_github_issues = ttl_cache(should_cache=bool)(get_github_issues)
@@ -1,7 +1,9 @@
 import os
 import logging
+import functools
 import re
-from typing import Optional, Tuple
+from itertools import islice
+from typing import Iterator, Optional, Tuple
 from google.cloud.logging import Client, DESCENDING
 from datetime import datetime, timedelta
 from src.models.service_types import ServiceType, SERVICE_CONFIG
@@ -35,6 +37,26 @@ def build_filter_variations(config: dict, service_name: str, project_id: str, ti
     return filter_variations
 
 
+def lookback_filter(hours: int) -> str:
+    """Build a timestamp filter for the last `hours` hours, ending now.
+
+    The window is recomputed on every call so its size stays fixed and the backend
+    scans a bounded range no matter how long the service has been running.
+
+    Args:
+        hours: The length of the lookback window in hours.
+
+    Returns:
+        A filter fragment such as ' AND timestamp >= "..." AND timestamp <= "..."'.
+    """
+    end = datetime.utcnow()
+    start = end - timedelta(hours=hours)
+    return f' AND timestamp >= "{start:%Y-%m-%dT%H:%M:%S}Z" AND timestamp <= "{end:%Y-%m-%dT%H:%M:%S}Z"'
+
+
+# Alphanumeric characters, hyphens, underscores, and dots, as in GCP resource names
+_VALID_IDENTIFIER = re.compile(r'^[a-zA-Z0-9._-]+$')
+
 def sanitize_identifier(identifier: str, identifier_type: str = "service_name") -> str:
     """Sanitize identifiers (service names, project IDs) to prevent filter injection.
 
@@ -53,7 +75,7 @@ def sanitize_identifier(identifier: str, identifier_type: str = "service_name")
 
     # Allow only alphanumeric characters, hyphens, underscores, and dots
     # This matches GCP naming conventions
-    if not re.match(r'^[a-zA-Z0-9._-]+$', identifier):
+    if not _VALID_IDENTIFIER.match(identifier):
         raise ValueError(
             f"Invalid {identifier_type}: '{identifier}'. "
             f"Only alphanumeric characters, hyphens, underscores, and dots are allowed."
@@ -65,6 +87,29 @@ def sanitize_identifier(identifier: str, identifier_type: str = "service_name")
 
     return identifier
 
+@functools.lru_cache(maxsize=4)
+def _get_client(project_id: str) -> Client:
+    """Returns a Cloud Logging client per project.
+
+    Creating a client discovers credentials and opens a gRPC channel, so it is done
+    once and the client is shared (it is safe to use from several threads).
+    """
+    return Client(project=project_id)
+
+def iter_log_lines(client: Client, log_filter: str, limit: int) -> Iterator[str]:
+    """Yields up to limit formatted log entries matching log_filter, newest first.
+
+    Entries are pulled page by page as the caller consumes them, and no page is
+    requested once limit entries have been yielded.
+    """
+    entries = client.list_entries(
+        filter_=log_filter,
+        order_by=DESCENDING,
+        page_size=limit,
+        max_results=limit
+    )
+    return map(str, islice(entries, limit))
+
 def get_gcp_logs(service_name: str, service_type: str = "cloud_run", limit: int = 500, page_token: Optional[str] = None, start_time: Optional[str] = None, end_time: Optional[str] = None) -> Tuple[str, Optional[str], Optional[Exception]]:
     """Fetches logs from a Google Cloud project for a specific service.
 
@@ -102,7 +147,7 @@ def get_gcp_logs(service_name: str, service_type: str = "cloud_run", limit: int
         return "", None, ValueError(error_msg)
 
     logger.info(f"Fetching logs for service: {service_name}, Type: {service_type_enum.value}, Project ID: {project_id}")
-    client = Client(project=project_id)
+    client = _get_client(project_id)
 
     # Build time filter component if provided, otherwise use default 24-hour lookback
     time_filter = ""
@@ -120,10 +165,8 @@ def get_gcp_logs(service_name: str, service_type: str = "cloud_run", limit: int
     else:
         # Default to 24-hour lookback, with automatic 48-hour retry if no logs found
         auto_retry_48h = True
-        end = datetime.utcnow()
-        start = end - timedelta(hours=24)
-        time_filter = f' AND timestamp >= "{start.isoformat()}Z" AND timestamp <= "{end.isoformat()}Z"'
-        logger.info(f"Using default 24-hour lookback: {start.isoformat()}Z to {end.isoformat()}Z")
+        time_filter = lookback_filter(24)
+        logger.info(f"Using default 24-hour lookback:{time_filter}")
 
     # Get service-specific configuration
     config = SERVICE_CONFIG.get(service_type_enum)
@@ -139,12 +182,7 @@ def get_gcp_logs(service_name: str, service_type: str = "cloud_run", limit: int
     try:
         for i, log_filter in enumerate(filter_variations):
             logger.info(f"[Filter {i+1}/{len(filter_variations)}] Trying: {log_filter}")
-            entries = client.list_entries(
-                filter_=log_filter,
-                order_by=DESCENDING,
-                page_size=limit
-            )
-            log_entries = [str(entry) for i, entry in enumerate(entries) if i < limit]
+            log_entries = list(iter_log_lines(client, log_filter, limit))
 
             if log_entries:
                 logs = "\n".join(log_entries)
@@ -156,21 +194,14 @@ def get_gcp_logs(service_name: str, service_type: str = "cloud_run", limit: int
         # If no logs found and we used the default 24-hour window, try 48 hours
         if auto_retry_48h:
             logger.info("No logs found in 24-hour window. Retrying with 48-hour window...")
-            end = datetime.utcnow()
-            start = end - timedelta(hours=48)
-            time_filter_48h = f' AND timestamp >= "{start.isoformat()}Z" AND timestamp <= "{end.isoformat()}Z"'
+            time_filter_48h = lookback_filter(48)
 
             # Rebuild filter variations with 48h time window
             filter_variations_48h = build_filter_variations(config, service_name, project_id, time_filter_48h)
 
             for i, log_filter in enumerate(filter_variations_48h):
                 logger.info(f"[48h Filter {i+1}/{len(filter_variations_48h)}] Trying: {log_filter}")
-                entries = client.list_entries(
-                    filter_=log_filter,
-                    order_by=DESCENDING,
-                    page_size=limit
-                )
-                log_entries = [str(entry) for i, entry in enumerate(entries) if i < limit]
+                log_entries = list(iter_log_lines(client, log_filter, limit))
 
                 if log_entries:
                     logs = "\n".join(log_entries)
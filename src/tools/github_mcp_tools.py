@@ -6,7 +6,9 @@ making GitHub operations available to LangGraph agents.
 """
 
 import os
+import atexit
 import logging
+import threading
 from typing import Optional, List, Dict, Any
 from langchain.tools import tool
 
@@ -14,15 +16,26 @@ from src.clients.github_mcp_client import create_github_mcp_client
 
 logger = logging.getLogger(__name__)
 
-# Global client instance (initialized lazily)
+# Global client instance (initialized lazily), shared by every tool call in the process
 _mcp_client = None
+_mcp_client_lock = threading.Lock()
 
 
 def get_mcp_client():
-    """Get or create the global MCP client instance."""
+    """Get or create the global MCP client instance.
+
+    The client is created at most once, even when tools run in parallel threads, and
+    its HTTP session is closed when the process exits.
+    """
     global _mcp_client
 
-    if _mcp_client is None:
+    if _mcp_client is not None:
+        return _mcp_client
+
+    with _mcp_client_lock:
+        if _mcp_client is not None:
+            return _mcp_client
+
         server_url = os.environ.get(
             "GITHUB_MCP_SERVER_URL",
             "https://api.githubcopilot.com/mcp"
@@ -39,6 +52,7 @@ def get_mcp_client():
             server_url=server_url,
             github_token=github_token
         )
+        atexit.register(_mcp_client.close)
         logger.info("GitHub MCP client initialized successfully")
 
     return _mcp_client
@@ -1,14 +1,16 @@
-import os
-from github import Github
+from src.tools import _gh
+from src.config import CONFIG
 
 def get_github_issues(repo_url: str) -> list[dict]:
     """Fetches both open and closed issues from a GitHub repository."""
     try:
-        token = os.environ["GITHUB_TOKEN"]
+        token = CONFIG.github_token
+        if not token:
+            print("Error fetching GitHub issues: GITHUB_TOKEN environment variable not set.")
+            return []
         repo_name = repo_url.replace("https://github.com/", "")
         
-        g = Github(token)
-        repo = g.get_repo(repo_name)
+        repo = _gh._get_repo(token, repo_name)
         
         issues = repo.get_issues(state="all")
         
@@ -0,0 +1,69 @@
+"""Tests for the bounded in-memory checkpointer."""
+
+import operator
+import os
+import sys
+from typing import Annotated, TypedDict
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from langchain_core.messages import HumanMessage
+from langgraph.graph import END, StateGraph
+
+from src.main import BoundedInMemorySaver
+
+
+class TestBoundedInMemorySaver:
+    """Tests for BoundedInMemorySaver."""
+
+    def run_thread(self, graph, thread_id):
+        """Write one turn for thread_id through a graph using the saver."""
+        graph.invoke({"messages": [HumanMessage(content="hi")]}, {"configurable": {"thread_id": thread_id}})
+
+    def make_graph(self, saver):
+        """Compile a one-node graph that only appends to the message list."""
+        class State(TypedDict):
+            messages: Annotated[list, operator.add]
+
+        workflow = StateGraph(State)
+        workflow.add_node("echo", lambda state: {"messages": ["echo"]})
+        workflow.set_entry_point("echo")
+        workflow.add_edge("echo", END)
+        return workflow.compile(checkpointer=saver)
+
+    def test_evicts_least_recently_written_thread(self):
+        """Test that the oldest thread is dropped once the limit is exceeded."""
+        saver = BoundedInMemorySaver(max_threads=2)
+        graph = self.make_graph(saver)
+
+        self.run_thread(graph, "a")
+        self.run_thread(graph, "b")
+        self.run_thread(graph, "a")
+        self.run_thread(graph, "c")
+
+        assert set(saver.storage) == {"a", "c"}
+        assert not any(key[0] == "b" for key in saver.writes)
+
+    def test_kept_thread_keeps_its_state(self):
+        """Test that a thread within the limit resumes with its earlier messages."""
+        saver = BoundedInMemorySaver(max_threads=2)
+        graph = self.make_graph(saver)
+
+        self.run_thread(graph, "a")
+        self.run_thread(graph, "a")
+
+        state = graph.get_state({"configurable": {"thread_id": "a"}})
+        assert len(state.values["messages"]) == 4
+
+    def test_delete_thread_forgets_it(self):
+        """Test that an explicitly deleted thread no longer counts towards the limit."""
+        saver = BoundedInMemorySaver(max_threads=1)
+        graph = self.make_graph(saver)
+
+        self.run_thread(graph, "a")
+        saver.delete_thread("a")
+        self.run_thread(graph, "b")
+
+        assert set(saver.storage) == {"b"}
+        assert len(saver._recent_threads) == 1
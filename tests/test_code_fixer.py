@@ -0,0 +1,305 @@
+"""Tests for the code fixer agent helpers."""
+
+import os
+import subprocess
+import sys
+from unittest.mock import Mock, patch
+
+import pytest
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.agents.code_fixer import _branch_name, _extract_json_block, _stream_json_block, _summarize_tree, _write_atomic, apply_fix, iter_files, list_tracked_files, select_candidate_files
+from src.agents.issue_creation_agent import Issue
+
+
+def make_git_repo(path, files):
+    """Create a git repository at path containing files and commit them."""
+    for name, content in files.items():
+        (path / name).parent.mkdir(parents=True, exist_ok=True)
+        (path / name).write_text(content)
+    subprocess.run(["git", "init", "-q"], check=True, cwd=path)
+    subprocess.run(["git", "add", "-A"], check=True, cwd=path)
+    subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", "commit", "-q", "-m", "init"],
+        check=True,
+        cwd=path,
+    )
+    return str(path)
+
+
+class TestExtractJsonBlock:
+    """Tests for the _extract_json_block helper."""
+
+    def test_extracts_fenced_json(self):
+        """Test that the body of a ```json block is returned."""
+        text = 'Here is the fix:\n```json\n{"file_path": "a.py"}\n```\nDone.'
+        assert _extract_json_block(text) == '{"file_path": "a.py"}'
+
+    def test_returns_first_block(self):
+        """Test that only the first fenced block is returned."""
+        text = '```json\n["a.py"]\n```\n```json\n["b.py"]\n```'
+        assert _extract_json_block(text) == '["a.py"]'
+
+    def test_ignores_fence_inside_a_line(self):
+        """Test that backticks inside the JSON body do not end the block."""
+        text = '```json\n{"code_fix": "use ``` fences"}\n```'
+        assert _extract_json_block(text) == '{"code_fix": "use ``` fences"}'
+
+    def test_missing_block_returns_none(self):
+        """Test that text without a JSON fence yields None."""
+        assert _extract_json_block('["a.py"]') is None
+        assert _extract_json_block("```json\nunterminated") is None
+
+
+class TestSummarizeTree:
+    """Tests for the directory summary sent to the file selector."""
+
+    def test_lists_small_directories_and_counts_large_ones(self):
+        """Test that large directories are summarized by count, largest first."""
+        paths = tuple(f"vendor/lib{i}.js" for i in range(25)) + ("src/app.py", "src/util.py", "setup.py")
+
+        assert _summarize_tree(paths).splitlines() == [
+            "vendor/ (25 files)",
+            "src/ (2 files): app.py, util.py",
+            "./ (1 files): setup.py",
+        ]
+
+    def test_truncates_at_a_line_boundary(self):
+        """Test that the summary is cut between lines to fit max_chars."""
+        paths = ("a/x.py", "b/y.py", "c/z.py")
+
+        assert _summarize_tree(paths, max_chars=30) == "a/ (1 files): x.py"
+
+
+class TestStreamJsonBlock:
+    """Tests for parsing a streamed Gemini response."""
+
+    @pytest.fixture(autouse=True)
+    def isolated_cache(self, tmp_path):
+        """Point the LLM response cache at a temporary directory."""
+        with patch('src.agents._llm_cache.CACHE_DIR', str(tmp_path)):
+            yield
+
+    @patch('src.agents.code_fixer._model')
+    def test_stops_once_block_is_complete(self, mock_model):
+        """Test that streaming stops after the closing fence arrives."""
+        chunks = ['Sure.\n```js', 'on\n{"file_path": ', '"a.py"}\n``', '`\n', 'trailing text']
+        consumed = []
+
+        def stream(prompt, stream):
+            for text in chunks:
+                consumed.append(text)
+                yield Mock(text=text)
+
+        mock_model.return_value.generate_content.side_effect = stream
+
+        json_text, _ = _stream_json_block("prompt")
+
+        assert json_text == '{"file_path": "a.py"}'
+        assert "trailing text" not in consumed
+
+    @patch('src.agents.code_fixer._model')
+    def test_returns_full_text_without_block(self, mock_model):
+        """Test that the whole response is returned when no block is present."""
+        mock_model.return_value.generate_content.return_value = iter([Mock(text="no "), Mock(text="json")])
+
+        assert _stream_json_block("prompt") == (None, "no json")
+
+    @patch('src.agents.code_fixer._model')
+    def test_skips_chunks_without_text(self, mock_model):
+        """Test that a chunk whose text accessor raises (e.g. a safety block) is skipped."""
+        class BlockedChunk:
+            @property
+            def text(self):
+                raise ValueError("The response has no text parts")
+
+        mock_model.return_value.generate_content.return_value = iter([Mock(text="no "), BlockedChunk(), Mock(text="json")])
+
+        assert _stream_json_block("prompt") == (None, "no json")
+
+    @patch('src.agents.code_fixer._model')
+    def test_reuses_cached_response(self, mock_model):
+        """Test that a repeated prompt is answered from the cache."""
+        mock_model.return_value.generate_content.return_value = iter([Mock(text='```json\n{"a": 1}\n```')])
+
+        first = _stream_json_block("prompt")
+        second = _stream_json_block("prompt")
+
+        assert first == second == ('{"a": 1}', '```json\n{"a": 1}\n```')
+        assert mock_model.return_value.generate_content.call_count == 1
+
+
+class TestIterFiles:
+    """Tests for the budgeted file reader."""
+
+    def test_reads_existing_files_in_order(self, tmp_path):
+        """Test that existing files are yielded in the requested order."""
+        (tmp_path / "a.py").write_text("print('a')")
+        (tmp_path / "b.py").write_text("print('b')")
+
+        result = list(iter_files(str(tmp_path), ["b.py", "missing.py", "a.py"]))
+
+        assert result == [("b.py", "print('b')"), ("a.py", "print('a')")]
+
+    def test_skips_binary_files(self, tmp_path):
+        """Test that files with NUL bytes near the start are not sent to the model."""
+        (tmp_path / "a.py").write_text("print('a')")
+        (tmp_path / "model.bin").write_bytes(b"\x89PNG\0\0data")
+
+        result = list(iter_files(str(tmp_path), ["model.bin", "a.py"]))
+
+        assert result == [("a.py", "print('a')")]
+
+    def test_skips_oversized_files_and_directories(self, tmp_path):
+        """Test that files over the byte cap and directories are skipped."""
+        (tmp_path / "a.py").write_text("print('a')")
+        (tmp_path / "vendored.js").write_text("x" * 40_000)
+        (tmp_path / "pkg").mkdir()
+
+        result = list(iter_files(str(tmp_path), ["vendored.js", "pkg", "a.py"]))
+
+        assert result == [("a.py", "print('a')")]
+
+    def test_respects_token_budget(self, tmp_path):
+        """Test that files beyond the token budget are skipped."""
+        (tmp_path / "a.py").write_text("x" * 200)
+        (tmp_path / "b.py").write_text("y" * 200)
+        (tmp_path / "c.py").write_text("z" * 100)
+
+        result = list(iter_files(str(tmp_path), ["a.py", "b.py", "c.py"], token_budget=80))
+
+        assert [path for path, _ in result] == ["a.py", "c.py"]
+
+    def test_prefers_files_mentioning_log_tokens(self, tmp_path):
+        """Test that files dense in logged identifiers are packed first."""
+        (tmp_path / "big.py").write_text("x = 1\n" * 100)
+        (tmp_path / "loader.py").write_text("def load_weights():\n    pass\n")
+
+        result = list(iter_files(str(tmp_path), ["big.py", "loader.py"], ["KeyError in load_weights"]))
+
+        assert [path for path, _ in result] == ["loader.py", "big.py"]
+
+
+class TestListTrackedFiles:
+    """Tests for listing the files tracked in a cloned repository."""
+
+    def test_lists_tracked_files_only(self, tmp_path):
+        """Test that untracked and skipped-directory files are excluded."""
+        repo_path = make_git_repo(tmp_path, {
+            "src/app.py": "",
+            "node_modules/lib/index.js": "",
+        })
+        (tmp_path / "untracked.py").write_text("")
+
+        assert list_tracked_files(repo_path) == ["src/app.py"]
+
+    def test_excludes_non_code_files(self, tmp_path):
+        """Test that images and lock files are not offered to the model."""
+        repo_path = make_git_repo(tmp_path, {
+            "Dockerfile": "",
+            "app.py": "",
+            "logo.png": "",
+            "poetry.lock": "",
+        })
+
+        assert list_tracked_files(repo_path) == ["Dockerfile", "app.py"]
+
+
+class TestSelectCandidateFiles:
+    """Tests for narrowing the repository file list using log tokens."""
+
+    def test_matches_file_names_from_logs(self, tmp_path):
+        """Test that files named in the log entries are selected."""
+        all_files = ["src/server.py", "src/utils.py", "README.md"]
+        repo_path = make_git_repo(tmp_path, {path: "" for path in all_files})
+
+        log_entries = ['File "/app/src/server.py", line 12, in handle']
+
+        assert select_candidate_files(repo_path, all_files, log_entries) == ["src/server.py"]
+
+    def test_matches_file_contents(self, tmp_path):
+        """Test that files mentioning a logged symbol are selected."""
+        repo_path = make_git_repo(tmp_path, {
+            "a.py": "def load_weights():\n    pass\n",
+            "b.py": "def other():\n    pass\n",
+        })
+
+        result = select_candidate_files(repo_path, ["a.py", "b.py"], ["KeyError in load_weights"])
+
+        assert result == ["a.py"]
+
+    def test_falls_back_to_all_files(self, tmp_path):
+        """Test that the full list is returned when nothing matches."""
+        repo_path = make_git_repo(tmp_path, {"a.py": "x = 1\n"})
+
+        assert select_candidate_files(repo_path, ["a.py"], ["zzzz"]) == ["a.py"]
+
+
+class TestWriteAtomic:
+    """Tests for the atomic file writer used by apply_fix."""
+
+    def test_replaces_existing_file_and_keeps_mode(self, tmp_path):
+        """Test that an existing file is replaced and keeps its permissions."""
+        target = tmp_path / "run.sh"
+        target.write_text("old")
+        target.chmod(0o755)
+
+        _write_atomic(str(target), "new")
+
+        assert target.read_text() == "new"
+        assert target.stat().st_mode & 0o777 == 0o755
+        assert [p.name for p in tmp_path.iterdir()] == ["run.sh"]
+
+    def test_creates_missing_directories(self, tmp_path):
+        """Test that a fix for a new file in a new directory is written."""
+        target = tmp_path / "pkg" / "new.py"
+
+        _write_atomic(str(target), "x = 1\n")
+
+        assert target.read_text() == "x = 1\n"
+
+
+class TestBranchName:
+    """Tests for building fix branch names from issue descriptions."""
+
+    def test_replaces_characters_git_rejects(self):
+        """Test that the branch name is a valid git ref."""
+        issue = Issue(description="KeyError: in /app/main.py .. @{x} ~^", priority="High", log_entries=[])
+        branch_name = _branch_name(issue)
+
+        assert branch_name.startswith("fix/keyerror-in-app-main-py-x-")
+        assert subprocess.run(["git", "check-ref-format", "--branch", branch_name], capture_output=True).returncode == 0
+
+    def test_distinct_descriptions_with_same_prefix_differ(self):
+        """Test that the hash suffix separates issues sharing their first 40 characters."""
+        prefix = "Model server fails to load weights from the cache"
+        first = _branch_name(Issue(description=prefix + " on start", priority="High", log_entries=[]))
+        second = _branch_name(Issue(description=prefix + " on reload", priority="High", log_entries=[]))
+
+        assert first != second
+
+
+class TestApplyFix:
+    """Tests for committing and pushing a fix."""
+
+    @patch('src.agents.code_fixer.create_pull_request')
+    def test_commits_new_file_and_pushes_branch(self, mock_create_pr, tmp_path):
+        """Test that a fix creating a new file is committed and pushed to origin."""
+        remote = tmp_path / "remote.git"
+        subprocess.run(["git", "init", "-q", "--bare", str(remote)], check=True)
+        (tmp_path / "work").mkdir()
+        repo_path = make_git_repo(tmp_path / "work", {"app.py": "x = 1\n"})
+        subprocess.run(["git", "remote", "add", "origin", str(remote)], check=True, cwd=repo_path)
+        issue = Issue(description="Crash on start", priority="High", log_entries=["boom"])
+
+        with patch.dict(os.environ, {"GIT_AUTHOR_NAME": "test", "GIT_AUTHOR_EMAIL": "test@example.com",
+                                     "GIT_COMMITTER_NAME": "test", "GIT_COMMITTER_EMAIL": "test@example.com"}):
+            apply_fix("pkg/new.py", "y = 2\n", issue, "https://github.com/o/r", repo_path)
+
+        shown = subprocess.run(["git", "show", f"{_branch_name(issue)}:pkg/new.py"], cwd=remote,
+                               capture_output=True, text=True, check=True).stdout
+        assert shown == "y = 2\n"
+        mock_create_pr.assert_called_once()
+        assert "boom" in mock_create_pr.call_args.args[3]
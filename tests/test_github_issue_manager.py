@@ -0,0 +1,244 @@
+"""Tests for the GitHub issue manager helpers."""
+
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+from github import GithubException
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.tools import _gh
+from src.config import Config
+from src.agents.github_issue_manager import (
+    SEARCH_MAX_RESULTS, _create_issue, _index_by_title, _lookup_existing, _recently_created, github_issue_manager_agent,
+)
+from src.agents.issue_creation_agent import Issue
+
+
+class TestIndexByTitle:
+    """Tests for indexing existing issues by title."""
+
+    def test_prefers_open_issue(self):
+        """Test that an open issue wins over a newer closed one with the same title."""
+        existing = [
+            {"title": "Crash", "number": 1, "state": "open", "labels": []},
+            {"title": "Crash", "number": 2, "state": "closed", "labels": []},
+        ]
+
+        assert _index_by_title(existing)["Crash"]["number"] == 1
+
+    def test_prefers_most_recent_issue(self):
+        """Test that the most recent issue wins when states are equal."""
+        existing = [
+            {"title": "Crash", "number": 3, "state": "closed", "labels": []},
+            {"title": "Crash", "number": 7, "state": "closed", "labels": []},
+            {"title": "Other", "number": 5, "state": "open", "labels": []},
+        ]
+
+        index = _index_by_title(existing)
+
+        assert index["Crash"]["number"] == 7
+        assert index["Other"]["number"] == 5
+
+
+class TestLookupExisting:
+    """Tests for choosing between title search and a full issue listing."""
+
+    def setup_method(self):
+        """Clear the cached GitHub objects and recently created issues between tests."""
+        _gh._get_client.cache_clear()
+        _recently_created.clear()
+
+    @patch('src.tools._gh.Github')
+    def test_small_batch_searches_titles(self, mock_github):
+        """Test that a small batch searches each title and keeps exact matches only."""
+        exact = MagicMock(number=4, state="open", labels=[])
+        exact.title = "Crash"
+        fuzzy = MagicMock(number=5, state="open", labels=[])
+        fuzzy.title = "Crash on start"
+        mock_github.return_value.search_issues.return_value = [exact, fuzzy]
+
+        result = _lookup_existing("token", "https://github.com/o/r", ["Crash"])
+
+        assert list(result) == ["Crash"]
+        assert result["Crash"]["number"] == 4
+        query = mock_github.return_value.search_issues.call_args.args[0]
+        assert query == 'repo:o/r is:issue in:title "Crash"'
+
+    @patch('src.agents.github_issue_manager.get_github_issues')
+    def test_large_batch_lists_all_issues(self, mock_get_issues):
+        """Test that a large batch lists the repository's issues once."""
+        mock_get_issues.return_value = [{"title": "a", "number": 1, "state": "open", "labels": []}]
+
+        result = _lookup_existing("token", "https://github.com/o/r", ["a", "b", "c", "d"])
+
+        mock_get_issues.assert_called_once_with("https://github.com/o/r")
+        assert result["a"]["number"] == 1
+
+    @patch('src.tools._gh.Github')
+    def test_search_reads_only_the_first_page(self, mock_github):
+        """Test that a title search stops after one page of results."""
+        def results():
+            for number in range(10 * SEARCH_MAX_RESULTS):
+                found = MagicMock(number=number, state="open", labels=[])
+                found.title = "Crash later"
+                yield found
+        produced = results()
+        mock_github.return_value.search_issues.return_value = produced
+
+        assert _lookup_existing("token", "https://github.com/o/r", ["Crash"]) == {}
+        assert len(list(produced)) == 9 * SEARCH_MAX_RESULTS
+
+
+class TestCreateIssue:
+    """Tests for creating a single issue with a rate limit retry."""
+
+    @patch('src.agents.github_issue_manager.time.sleep')
+    def test_retries_once_after_secondary_rate_limit(self, mock_sleep):
+        """Test that a 403 waits for Retry-After and retries."""
+        repo = MagicMock()
+        repo.create_issue.side_effect = [GithubException(403, headers={"retry-after": "2"}), "created"]
+
+        assert _create_issue(repo, "Crash", "body", ["High"]) == "created"
+        mock_sleep.assert_called_once_with(2)
+
+    def test_other_errors_are_raised(self):
+        """Test that non rate limit errors are not retried."""
+        repo = MagicMock()
+        repo.create_issue.side_effect = GithubException(422)
+
+        with pytest.raises(GithubException):
+            _create_issue(repo, "Crash", "body", ["High"])
+        assert repo.create_issue.call_count == 1
+
+    @patch('src.agents.github_issue_manager.time.sleep')
+    def test_permission_403_is_raised_without_waiting(self, mock_sleep):
+        """Test that a 403 without any rate limit signal is not retried."""
+        repo = MagicMock()
+        repo.create_issue.side_effect = GithubException(
+            403, data={"message": "Resource not accessible by integration"}, headers={"x-ratelimit-remaining": "4999"}
+        )
+
+        with pytest.raises(GithubException):
+            _create_issue(repo, "Crash", "body", ["High"])
+        assert repo.create_issue.call_count == 1
+        mock_sleep.assert_not_called()
+
+    @patch('src.agents.github_issue_manager.time.sleep')
+    def test_secondary_rate_limit_message_is_retried(self, mock_sleep):
+        """Test that a 403 naming the secondary rate limit waits the default time and retries."""
+        repo = MagicMock()
+        repo.create_issue.side_effect = [
+            GithubException(403, data={"message": "You have exceeded a secondary rate limit."}), "created"
+        ]
+
+        assert _create_issue(repo, "Crash", "body", ["High"]) == "created"
+        mock_sleep.assert_called_once_with(60)
+
+    @patch('src.agents.github_issue_manager.time.sleep')
+    def test_retry_after_http_date_is_honored(self, mock_sleep):
+        """Test that a Retry-After given as an HTTP date waits until that time."""
+        retry_at = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+        repo = MagicMock()
+        repo.create_issue.side_effect = [GithubException(403, headers={"Retry-After": retry_at}), "created"]
+
+        assert _create_issue(repo, "Crash", "body", ["High"]) == "created"
+        assert 28 <= mock_sleep.call_args.args[0] <= 30
+
+    @patch('src.agents.github_issue_manager.time.sleep')
+    def test_unparseable_retry_after_uses_default(self, mock_sleep):
+        """Test that a Retry-After that is neither seconds nor a date waits the default time."""
+        repo = MagicMock()
+        repo.create_issue.side_effect = [GithubException(403, headers={"retry-after": "soon"}), "created"]
+
+        assert _create_issue(repo, "Crash", "body", ["High"]) == "created"
+        mock_sleep.assert_called_once_with(60)
+
+
+class TestGithubIssueManagerAgent:
+    """Tests for the issue creation flow."""
+
+    def setup_method(self):
+        """Clear the cached GitHub objects and recently created issues between tests."""
+        _gh._get_client.cache_clear()
+        _gh._get_repo.cache_clear()
+        _recently_created.clear()
+
+    @patch('src.agents.github_issue_manager.CONFIG', Config(github_token="token"))
+    @patch('src.tools._gh.Github')
+    def test_creates_new_issues_and_skips_duplicates(self, mock_github):
+        """Test that only issues without a matching title are created."""
+        old = MagicMock(number=1, state="closed", labels=[])
+        old.title = "Old crash"
+        mock_github.return_value.search_issues.side_effect = lambda query: [old] if "Old crash" in query else []
+        repo = mock_github.return_value.get_repo.return_value
+        repo.create_issue.return_value = MagicMock(number=2, html_url="https://github.com/o/r/issues/2")
+        issues = [
+            Issue(description="Old crash", priority="High", log_entries=["a"]),
+            Issue(description="New crash", priority="Low", log_entries=["b"]),
+        ]
+
+        result = github_issue_manager_agent(issues, "https://github.com/o/r")
+
+        repo.create_issue.assert_called_once()
+        assert repo.create_issue.call_args.kwargs["title"] == "New crash"
+        assert repo.create_issue.call_args.kwargs["labels"] == ["Low"]
+        assert repo.create_issue.call_args.kwargs["body"] == "New crash\n\n**Relevant Log Entries:**\n```\nb\n```\n"
+        assert result["github_issue_manager_history"][0].startswith("Created 1 GitHub issue(s), skipped 1.")
+
+    @patch('src.agents.github_issue_manager.CONFIG', Config(github_token="token"))
+    @patch('src.tools._gh.Github')
+    def test_repeated_title_in_batch_is_created_once(self, mock_github):
+        """Test that two issues with the same title in one batch create a single issue."""
+        mock_github.return_value.search_issues.return_value = []
+        repo = mock_github.return_value.get_repo.return_value
+        repo.create_issue.return_value = MagicMock(number=2, html_url="https://github.com/o/r/issues/2")
+        issues = [
+            Issue(description="Crash", priority="High", log_entries=["a"]),
+            Issue(description="Crash", priority="High", log_entries=["b"]),
+        ]
+
+        result = github_issue_manager_agent(issues, "https://github.com/o/r")
+
+        repo.create_issue.assert_called_once()
+        mock_github.return_value.search_issues.assert_called_once()
+        assert "appears more than once in this batch" in result["github_issue_manager_history"][0]
+
+    @patch('src.agents.github_issue_manager.CONFIG', Config(github_token="token"))
+    @patch('src.tools._gh.Github')
+    def test_issue_created_moments_ago_is_not_filed_again(self, mock_github):
+        """Test that a title created earlier in this process is skipped before search indexes it."""
+        mock_github.return_value.search_issues.return_value = []
+        repo = mock_github.return_value.get_repo.return_value
+        repo.create_issue.return_value = MagicMock(number=2, html_url="https://github.com/o/r/issues/2")
+        issues = [Issue(description="Crash", priority="High", log_entries=["a"])]
+
+        github_issue_manager_agent(issues, "https://github.com/o/r")
+        result = github_issue_manager_agent(issues, "https://github.com/o/r")
+
+        repo.create_issue.assert_called_once()
+        assert "already exists as open issue (#2)" in result["github_issue_manager_history"][0]
+
+
+class TestGetRepo:
+    """Tests for the cached repository lookup."""
+
+    def setup_method(self):
+        """Clear the cached GitHub objects between tests."""
+        _gh._get_client.cache_clear()
+        _gh._get_repo.cache_clear()
+
+    @patch('src.tools._gh.Github')
+    def test_repo_is_resolved_once(self, mock_github):
+        """Test that repeated lookups reuse the repository object."""
+        first = _gh._get_repo("token", "o/r")
+        second = _gh._get_repo("token", "o/r")
+
+        assert first is second
+        mock_github.assert_called_once_with("token", per_page=100)
+        mock_github.return_value.get_repo.assert_called_once_with("o/r")
@@ -0,0 +1,107 @@
+"""Tests for the GitHub MCP client."""
+
+import os
+import sys
+from unittest.mock import patch
+
+import orjson
+import pytest
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.clients.github_mcp_client import GitHubMCPClient
+
+
+def text_result(text):
+    """Build a tools/call result holding a single text item."""
+    return {"content": [{"type": "text", "text": text}]}
+
+
+class TestSession:
+    """Tests for the HTTP session used to reach the MCP server."""
+
+    def test_retries_transient_failures_but_not_reads(self):
+        """Test that 429/503 are retried for POST while read errors, 500s and gateway errors are not."""
+        retry = GitHubMCPClient(github_token="token").session.get_adapter("https://api.example.com").max_retries
+
+        assert retry.is_retry("POST", 429)
+        assert retry.is_retry("POST", 503)
+        assert not retry.is_retry("POST", 500)
+        assert not retry.is_retry("POST", 502)
+        assert not retry.is_retry("POST", 504)
+        assert retry.read == 0
+        assert retry.respect_retry_after_header
+
+
+class TestCallTool:
+    """Tests for single JSON-RPC tool calls."""
+
+    @patch('src.clients.github_mcp_client.requests.Session.post')
+    def test_list_issues_decodes_text_result(self, mock_post):
+        """Test that the request body is JSON and a JSON text result is decoded."""
+        mock_post.return_value.content = orjson.dumps(
+            {"jsonrpc": "2.0", "id": 1, "result": text_result('[{"number": 1, "title": "Boom"}]')}
+        )
+        client = GitHubMCPClient(github_token="token")
+
+        assert client.list_issues("o", "r") == [{"number": 1, "title": "Boom"}]
+        request = orjson.loads(mock_post.call_args.kwargs["data"])
+        assert request["method"] == "tools/call"
+        assert request["params"] == {"name": "list_issues", "arguments": {"owner": "o", "repo": "r", "state": "open"}}
+
+    @patch('src.clients.github_mcp_client.requests.Session.post')
+    def test_invalid_json_response_raises(self, mock_post):
+        """Test that a response body that is not JSON is reported as an error."""
+        mock_post.return_value.content = b"<html>bad gateway</html>"
+        client = GitHubMCPClient(github_token="token")
+
+        with pytest.raises(Exception, match="invalid JSON"):
+            client.call_tool("list_issues", {})
+
+
+class TestToolListCache:
+    """Tests for persisting the server's tool list between runs."""
+
+    @pytest.fixture(autouse=True)
+    def isolated_cache(self, tmp_path):
+        """Point the tool list cache at a temporary directory."""
+        with patch('src.clients.github_mcp_client.TOOLS_CACHE_DIR', str(tmp_path)):
+            yield tmp_path
+
+    @patch('src.clients.github_mcp_client.requests.Session.post')
+    def test_second_client_reuses_cached_tools(self, mock_post):
+        """Test that a new client for the same server does not call tools/list again."""
+        mock_post.return_value.content = orjson.dumps({
+            "jsonrpc": "2.0", "id": 1,
+            "result": {"tools": [{"name": "create_issue", "description": "Create", "inputSchema": {}}]},
+        })
+
+        first = GitHubMCPClient(github_token="token").get_available_tools()
+        second = GitHubMCPClient(github_token="token").get_available_tools()
+
+        assert [tool.name for tool in second] == [tool.name for tool in first] == ["create_issue"]
+        assert mock_post.call_count == 1
+
+    @patch('src.clients.github_mcp_client.time.time')
+    @patch('src.clients.github_mcp_client.requests.Session.post')
+    def test_expired_cache_is_refetched(self, mock_post, mock_time):
+        """Test that an entry older than the TTL is ignored."""
+        mock_post.return_value.content = orjson.dumps({"jsonrpc": "2.0", "id": 1, "result": {"tools": []}})
+        mock_time.return_value = 1000.0
+        GitHubMCPClient(github_token="token").get_available_tools()
+
+        mock_time.return_value = 1000.0 + 2 * 24 * 60 * 60
+        GitHubMCPClient(github_token="token").get_available_tools()
+
+        assert mock_post.call_count == 2
+
+    @patch('src.clients.github_mcp_client.requests.Session.post')
+    def test_cache_is_keyed_by_server(self, mock_post):
+        """Test that tools cached for one server are not used for another."""
+        mock_post.return_value.content = orjson.dumps({"jsonrpc": "2.0", "id": 1, "result": {"tools": []}})
+
+        GitHubMCPClient(server_url="https://a.example/mcp", github_token="token").get_available_tools()
+        GitHubMCPClient(server_url="https://b.example/mcp", github_token="token").get_available_tools()
+
+        assert mock_post.call_count == 2
@@ -0,0 +1,76 @@
+"""Tests for the issue creation agent."""
+
+import os
+import sys
+from unittest.mock import patch
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.agents.issue_creation_agent import issue_creation_agent
+
+
+class TestIssueCreationAgent:
+    """Tests for turning logs into issues."""
+
+    @patch('src.agents.issue_creation_agent._model')
+    @patch('src.agents.issue_creation_agent._cached_get_github_issues')
+    @patch('src.agents.issue_creation_agent._cached_get_gcp_logs')
+    def test_fetches_logs_and_issues_and_parses_response(self, mock_logs, mock_issues, mock_model):
+        """Test that logs and existing issues are both fetched and the response is parsed."""
+        mock_logs.return_value = ("ERROR boom", None, None)
+        mock_issues.return_value = [{"title": "Old", "number": 1, "state": "open", "labels": []}]
+        mock_model.return_value.generate_content.return_value.text = (
+            '[{"description": "Boom", "priority": "High", "log_entries": ["ERROR boom"]}]'
+        )
+
+        issues = issue_creation_agent("svc", "https://github.com/o/r")
+
+        mock_issues.assert_called_once_with("https://github.com/o/r")
+        assert [issue.description for issue in issues] == ["Boom"]
+        prompt = mock_model.return_value.generate_content.call_args.args[0]
+        # Static instructions lead, so repeated calls share a cacheable prefix
+        assert prompt.startswith("Analyze the logs below")
+        assert prompt.index("Old") < prompt.index("ERROR boom")
+        assert prompt.index("If no issues are found") < prompt.index("Old")
+        generation_config = mock_model.return_value.generate_content.call_args.kwargs["generation_config"]
+        assert generation_config["response_mime_type"] == "application/json"
+
+    @patch('src.agents.issue_creation_agent._model')
+    @patch('src.agents.issue_creation_agent._cached_get_github_issues')
+    @patch('src.agents.issue_creation_agent._cached_get_gcp_logs')
+    def test_invalid_response_returns_no_issues(self, mock_logs, mock_issues, mock_model):
+        """Test that a response that is not valid JSON yields an empty list."""
+        mock_logs.return_value = ("ERROR boom", None, None)
+        mock_model.return_value.generate_content.return_value.text = '[{"description": "Boom"'
+
+        assert issue_creation_agent("svc", None) == []
+
+    @patch('src.agents.issue_creation_agent._model')
+    @patch('src.agents.issue_creation_agent._cached_get_github_issues')
+    @patch('src.agents.issue_creation_agent._cached_get_gcp_logs')
+    def test_healthy_logs_skip_the_model(self, mock_logs, mock_issues, mock_model):
+        """Test that logs without error-like lines return no issues without calling Gemini."""
+        mock_logs.return_value = ("INFO start\nINFO ready", None, None)
+
+        assert issue_creation_agent("svc", None) == []
+        mock_model.assert_not_called()
+
+    @patch('src.agents.issue_creation_agent._cached_get_github_issues')
+    @patch('src.agents.issue_creation_agent._cached_get_gcp_logs')
+    def test_log_error_returns_no_issues(self, mock_logs, mock_issues):
+        """Test that a log fetch error yields an empty list."""
+        mock_logs.return_value = ("", None, "permission denied")
+
+        assert issue_creation_agent("svc", None) == []
+        mock_issues.assert_not_called()
+
+    @patch('src.agents.issue_creation_agent._model')
+    @patch('src.agents.issue_creation_agent._cached_get_github_issues')
+    @patch('src.agents.issue_creation_agent._cached_get_gcp_logs')
+    def test_issue_missing_fields_returns_no_issues(self, mock_logs, mock_issues, mock_model):
+        """Test that an array whose items do not match the Issue schema yields an empty list."""
+        mock_logs.return_value = ("ERROR boom", None, None)
+        mock_model.return_value.generate_content.return_value.text = '[{"description": "Boom"}]'
+
+        assert issue_creation_agent("svc", None) == []
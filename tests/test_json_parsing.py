@@ -0,0 +1,41 @@
+"""Tests for parsing JSON out of LLM responses."""
+
+import json
+import os
+import sys
+
+import pytest
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.agents._json import _parse_json_block
+
+
+class TestParseJsonBlock:
+    """Tests for the _parse_json_block helper."""
+
+    def test_parses_fenced_array(self):
+        """Test that a ```json fenced array is parsed."""
+        assert _parse_json_block('```json\n[{"a": 1}]\n```') == [{"a": 1}]
+
+    def test_parses_bare_object_with_prose(self):
+        """Test that surrounding prose and trailing text are ignored."""
+        assert _parse_json_block('Here you go: {"title": "x"} Hope this helps!') == {"title": "x"}
+
+    def test_starts_after_the_fence(self):
+        """Test that brackets in prose before the fence are skipped."""
+        assert _parse_json_block('Issues [see below]:\n```json\n["a"]\n```') == ["a"]
+
+    def test_keeps_leading_json_letters(self):
+        """Test that values starting with j, s, o or n are not stripped like lstrip('json') did."""
+        assert _parse_json_block('```json\n{"note": "json is fine"}\n```') == {"note": "json is fine"}
+
+    def test_no_json_raises(self):
+        """Test that text without JSON raises JSONDecodeError."""
+        with pytest.raises(json.JSONDecodeError):
+            _parse_json_block("log_explorer")
+
+    def test_first_of_several_values(self):
+        """Test that only the first value is returned when several follow each other."""
+        assert _parse_json_block('["a"] and later ["b"]') == ["a"]
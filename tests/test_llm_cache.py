@@ -0,0 +1,118 @@
+"""Tests for the on-disk LLM response cache."""
+
+import os
+import sys
+from unittest.mock import Mock, PropertyMock, patch
+
+import pytest
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.agents._llm_cache import _model, cached_generate, load_cached, store_cached, stream_generate
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path):
+    """Point the LLM response cache at a temporary directory and forget cached models."""
+    _model.cache_clear()
+    with patch('src.agents._llm_cache.CACHE_DIR', str(tmp_path)):
+        yield tmp_path
+    _model.cache_clear()
+
+
+class TestCachedGenerate:
+    """Tests for cached_generate."""
+
+    @patch('google.generativeai.GenerativeModel')
+    def test_second_call_is_served_from_cache(self, mock_model):
+        """Test that the model is only called once for a repeated prompt."""
+        mock_model.return_value.generate_content.return_value.text = "answer"
+
+        assert cached_generate("model", "prompt") == "answer"
+        assert cached_generate("model", "prompt") == "answer"
+        assert mock_model.return_value.generate_content.call_count == 1
+
+    @patch('google.generativeai.GenerativeModel')
+    def test_skip_cache_calls_model(self, mock_model):
+        """Test that skip_cache bypasses a cached response and refreshes it."""
+        store_cached("model", "prompt", "stale")
+        mock_model.return_value.generate_content.return_value.text = "fresh"
+
+        assert cached_generate("model", "prompt", skip_cache=True) == "fresh"
+        assert load_cached("model", "prompt") == "fresh"
+
+    @patch('google.generativeai.GenerativeModel')
+    def test_model_is_created_once_per_name(self, mock_model):
+        """Test that prompts for the same model share one GenerativeModel."""
+        mock_model.return_value.generate_content.return_value.text = "answer"
+
+        cached_generate("model", "first")
+        cached_generate("model", "second")
+
+        mock_model.assert_called_once_with("model", system_instruction=None)
+
+    @patch('google.generativeai.GenerativeModel')
+    def test_streamed_and_cached_calls_share_model(self, mock_model):
+        """Test that omitting the system instruction reuses the same GenerativeModel."""
+        mock_model.return_value.generate_content.return_value.text = "answer"
+
+        cached_generate("model", "first")
+        mock_model.return_value.generate_content.return_value = iter([])
+        stream_generate("model", "second")
+
+        mock_model.assert_called_once_with("model", system_instruction=None)
+
+    def test_key_includes_model_name(self):
+        """Test that responses are not shared between models."""
+        store_cached("model-a", "prompt", "a")
+
+        assert load_cached("model-a", "prompt") == "a"
+        assert load_cached("model-b", "prompt") is None
+
+    def test_key_includes_system_instruction(self):
+        """Test that responses are not shared between system instructions."""
+        store_cached("model", "prompt", "a", system_instruction="route")
+
+        assert load_cached("model", "prompt", system_instruction="route") == "a"
+        assert load_cached("model", "prompt") is None
+
+    def test_entries_older_than_max_age_are_a_miss(self, isolated_cache):
+        """Test that max_age expires old entries."""
+        store_cached("model", "prompt", "a")
+        for entry in isolated_cache.iterdir():
+            os.utime(entry, (0, 0))
+
+        assert load_cached("model", "prompt") == "a"
+        assert load_cached("model", "prompt", max_age=3600) is None
+
+    def test_corrupt_entry_is_a_miss(self, isolated_cache):
+        """Test that an unreadable cache file is treated as a miss."""
+        store_cached("model", "prompt", "a")
+        for entry in isolated_cache.iterdir():
+            entry.write_text("{not json")
+
+        assert load_cached("model", "prompt") is None
+
+
+class TestStreamGenerate:
+    """Tests for stream_generate."""
+
+    @patch('google.generativeai.GenerativeModel')
+    def test_passes_chunks_and_returns_full_text(self, mock_model):
+        """Test that each chunk reaches on_chunk and the joined text is returned."""
+        mock_model.return_value.generate_content.return_value = iter([Mock(text="Hello, "), Mock(text="world")])
+        received = []
+
+        assert stream_generate("model", "prompt", received.append) == "Hello, world"
+        assert received == ["Hello, ", "world"]
+        mock_model.return_value.generate_content.assert_called_once_with("prompt", stream=True)
+
+    @patch('google.generativeai.GenerativeModel')
+    def test_skips_chunks_without_text(self, mock_model):
+        """Test that a chunk whose text accessor raises is skipped."""
+        blocked = Mock()
+        type(blocked).text = PropertyMock(side_effect=ValueError("no parts"))
+        mock_model.return_value.generate_content.return_value = iter([Mock(text="partial"), blocked])
+
+        assert stream_generate("model", "prompt") == "partial"
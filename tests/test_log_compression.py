@@ -0,0 +1,84 @@
+"""Tests for compressing logs before they are sent to the model."""
+
+import os
+import sys
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.agents._logs import MAX_COMPRESSED_LINES, _compress_logs, _has_problem_lines, _line_count
+
+
+class TestLineCount:
+    """Tests for the _line_count helper."""
+
+    def test_matches_splitlines(self):
+        """Test that the count agrees with len(splitlines()) with and without a trailing newline."""
+        for text in ["", "a", "a\n", "a\nb", "a\nb\n", "\n\n"]:
+            assert _line_count(text) == len(text.splitlines())
+
+
+class TestHasProblemLines:
+    """Tests for the _has_problem_lines pre-check."""
+
+    def test_detects_error_like_lines(self):
+        """Test that errors, warnings and failures are detected and plain info is not."""
+        assert _has_problem_lines("INFO ok\nsevere: Build FAILED")
+        assert _has_problem_lines("severity='WARNING' disk almost full")
+        assert not _has_problem_lines("INFO start\nINFO handler ready")
+
+    def test_detects_exception_class_names_and_plurals(self):
+        """Test that CamelCase exception names and plural forms count as problems."""
+        assert _has_problem_lines("java.lang.NullPointerException")
+        assert _has_problem_lines("ValueError: bad")
+        assert _has_problem_lines("ConnectionRefusedError")
+        assert _has_problem_lines("3 errors occurred")
+        assert _has_problem_lines("Exceptions thrown")
+
+
+class TestCompressLogs:
+    """Tests for the _compress_logs helper."""
+
+    def test_short_logs_are_unchanged(self):
+        """Test that logs below the threshold are returned as is."""
+        logs = "INFO start\nINFO ready"
+        assert _compress_logs(logs) == logs
+
+    def test_keeps_errors_with_context(self):
+        """Test that error lines and their neighbours survive compression."""
+        lines = [f"INFO request {i} ok" for i in range(500)]
+        lines[250] = "ERROR model failed to load"
+
+        result = _compress_logs("\n".join(lines)).splitlines()
+
+        # Context lines differing only in numbers collapse into the first, with a count
+        assert result == ["[x4] INFO request 248 ok", "ERROR model failed to load"]
+
+    def test_deduplicates_repeated_errors(self):
+        """Test that errors differing only in numbers are kept once with their count."""
+        lines = [f"2024-01-01T00:00:{i % 60:02d}Z ERROR timeout after {i}ms" for i in range(400)]
+
+        assert _compress_logs("\n".join(lines)) == "[x400] 2024-01-01T00:00:00Z ERROR timeout after 0ms"
+
+    def test_matches_query_words(self):
+        """Test that lines mentioning words from the query are kept."""
+        lines = [f"INFO tick {i}" for i in range(300)]
+        lines[10] = "INFO cuda graph capture took 40s"
+
+        result = _compress_logs("\n".join(lines), "Why is CUDA graph capture slow?")
+
+        assert "INFO cuda graph capture took 40s" in result
+
+    def test_falls_back_to_most_recent_lines(self):
+        """Test that the first distinct lines are returned when nothing matches."""
+        lines = [f"INFO worker {chr(97 + i // 26)}{chr(97 + i % 26)} ready" for i in range(676)]
+
+        result = _compress_logs("\n".join(lines)).splitlines()
+
+        assert result == lines[:MAX_COMPRESSED_LINES]
+
+    def test_fallback_folds_repeated_lines(self):
+        """Test that repeated lines are folded even when nothing matches."""
+        lines = [f"INFO tick {i}" for i in range(1000)]
+
+        assert _compress_logs("\n".join(lines)) == "[x1000] INFO tick 0"
@@ -0,0 +1,44 @@
+"""Tests for the log explorer agent's prompt."""
+
+import os
+import sys
+from unittest.mock import patch
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src.agents.log_explorer import log_explorer_agent
+
+
+class TestLogExplorerPrompt:
+    """Tests for the prompt built by log_explorer_agent."""
+
+    @patch('src.agents.log_explorer.stream_generate', return_value="answer")
+    @patch('src.agents.log_explorer._cached_get_gcp_logs', return_value=("ERROR boom\n", None, None))
+    def test_history_precedes_logs_and_question_is_sent_once(self, mock_logs, mock_generate):
+        """Test that earlier turns lead the prompt and the current question appears only after the logs."""
+        history = [
+            HumanMessage(content="any errors?"),
+            AIMessage(content="one error"),
+            HumanMessage(content="when did it start?"),
+        ]
+
+        assert log_explorer_agent("svc", "when did it start?", conversation_history=history) == "answer"
+
+        prompt = mock_generate.call_args.args[1]
+        assert prompt.count("when did it start?") == 1
+        assert prompt.index("User: any errors?\nBot: one error\n") < prompt.index("ERROR boom") < prompt.index("when did it start?")
+
+    @patch('src.agents.log_explorer.answer_cache')
+    @patch('src.agents.log_explorer.stream_generate', return_value="answer")
+    @patch('src.agents.log_explorer._cached_get_gcp_logs', return_value=("ERROR boom\n", None, None))
+    def test_follow_up_answers_are_not_cached(self, mock_logs, mock_generate, mock_cache):
+        """Test that an answer depending on earlier turns is neither looked up nor stored."""
+        history = [HumanMessage(content="any errors?"), AIMessage(content="one error"), HumanMessage(content="why?")]
+
+        log_explorer_agent("svc", "why?", conversation_history=history)
+
+        mock_cache.lookup.assert_not_called()
+        mock_cache.store.assert_not_called()
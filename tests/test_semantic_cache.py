@@ -0,0 +1,102 @@
+"""Tests for the semantic answer cache."""
+
+import math
+import os
+import sys
+from unittest.mock import patch
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.agents._semantic_cache import SemanticCache
+
+
+def unit(*values):
+    """Scale a vector to unit length."""
+    norm = math.sqrt(sum(v * v for v in values))
+    return [v / norm for v in values]
+
+
+# Two phrasings of the same question share a direction; an unrelated one is orthogonal
+EMBEDDINGS = {
+    "show errors for service x": unit(1.0, 0.0),
+    "what errors in service x": unit(0.99, 0.05),
+    "how many requests did x serve": unit(0.0, 1.0),
+}
+
+
+def make_cache(**kwargs):
+    """Build a cache embedding queries from the fixed table above."""
+    return SemanticCache(embed=EMBEDDINGS.__getitem__, **kwargs)
+
+
+def fail(text):
+    """Stand in for an embedding call that errors."""
+    raise RuntimeError("quota exceeded")
+
+
+class TestSemanticCache:
+    """Tests for SemanticCache."""
+
+    def test_similar_query_reuses_answer(self):
+        """Test that a rephrased question in the same namespace gets the stored answer."""
+        cache = make_cache()
+        cache.store("svc", "show errors for service x", "two errors")
+
+        assert cache.lookup("svc", "what errors in service x")[0] == "two errors"
+
+    def test_dissimilar_query_and_other_namespace_miss(self):
+        """Test that unrelated questions and other services do not share answers."""
+        cache = make_cache()
+        cache.store("svc", "show errors for service x", "two errors")
+
+        assert cache.lookup("svc", "how many requests did x serve")[0] is None
+        assert cache.lookup("other", "what errors in service x")[0] is None
+
+    def test_expired_entries_miss(self):
+        """Test that answers older than the ttl are not reused."""
+        cache = make_cache(ttl=10)
+        with patch('src.agents._semantic_cache.time.monotonic', return_value=0):
+            cache.store("svc", "show errors for service x", "two errors")
+
+        with patch('src.agents._semantic_cache.time.monotonic', return_value=11):
+            assert cache.lookup("svc", "show errors for service x")[0] is None
+
+    def test_evicts_least_recently_used(self):
+        """Test that the oldest unused entry is dropped beyond maxsize."""
+        cache = make_cache(maxsize=1)
+        cache.store("a", "show errors for service x", "first")
+        cache.store("b", "show errors for service x", "second")
+
+        assert cache.lookup("a", "show errors for service x")[0] is None
+        assert cache.lookup("b", "show errors for service x")[0] == "second"
+
+    def test_cold_namespace_is_not_embedded(self):
+        """Test that a lookup with nothing cached for the namespace skips the embedding call."""
+        cache = SemanticCache(embed=fail)
+
+        assert cache.lookup("svc", "anything") == (None, None)
+
+    def test_store_reuses_lookup_embedding(self):
+        """Test that a query embedded by a missed lookup is not embedded again on store."""
+        calls = []
+        def embed(text):
+            calls.append(text)
+            return EMBEDDINGS[text]
+        cache = SemanticCache(embed=embed)
+        cache.store("svc", "show errors for service x", "two errors")
+
+        value, embedding = cache.lookup("svc", "how many requests did x serve")
+        cache.store("svc", "how many requests did x serve", "ten", embedding)
+
+        assert value is None
+        assert calls == ["show errors for service x", "how many requests did x serve"]
+
+    def test_embedding_failure_is_a_miss(self):
+        """Test that a failing embedding call yields no answer and stores nothing."""
+        cache = SemanticCache(embed=fail)
+        cache._entries[0] = (float("inf"), "svc", [1.0], "cached")
+
+        assert cache.lookup("svc", "anything") == (None, None)
+        cache.store("other", "anything", "answer")
+        assert len(cache._entries) == 1
@@ -3,13 +3,22 @@
 import os
 import sys
 import pytest
+from datetime import datetime
 from unittest.mock import Mock, patch, MagicMock
 
 # Add the project root to the Python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from src.models.service_types import ServiceType, SERVICE_CONFIG
-from src.tools.gcp_logging_tool import get_gcp_logs, sanitize_identifier, build_filter_variations
+from src.tools.gcp_logging_tool import _get_client, get_gcp_logs, lookback_filter, sanitize_identifier, build_filter_variations
+
+
+@pytest.fixture(autouse=True)
+def fresh_logging_client():
+    """Forget shared logging clients so each test sees its own patched Client."""
+    _get_client.cache_clear()
+    yield
+    _get_client.cache_clear()
 
 
 class TestServiceTypeEnum:
@@ -287,6 +296,40 @@ class TestGetGcpLogsMultiService:
             assert error is None, f"Service type {service_type.value} failed"
 
 
+    @patch.dict(os.environ, {"GOOGLE_CLOUD_PROJECT": "test-project"})
+    @patch('src.tools.gcp_logging_tool.Client')
+    def test_stops_reading_entries_at_limit(self, mock_client_class):
+        """Test that entries beyond the limit are never pulled from the API."""
+        mock_client = Mock()
+        mock_client_class.return_value = mock_client
+        consumed = []
+
+        def entries(**kwargs):
+            for i in range(1000):
+                consumed.append(i)
+                yield f"entry {i}"
+
+        mock_client.list_entries.side_effect = entries
+
+        logs, page_token, error = get_gcp_logs("my-service", service_type="cloud_run", limit=10)
+
+        assert logs.splitlines() == [f"entry {i}" for i in range(10)]
+        assert len(consumed) == 10
+        assert mock_client.list_entries.call_args[1]['max_results'] == 10
+
+
+    @patch.dict(os.environ, {"GOOGLE_CLOUD_PROJECT": "test-project"})
+    @patch('src.tools.gcp_logging_tool.Client')
+    def test_client_is_reused_across_calls(self, mock_client_class):
+        """Test that the logging client is created once per project."""
+        mock_client_class.return_value.list_entries.return_value = [Mock(payload="test log entry")]
+
+        get_gcp_logs("my-service", service_type="cloud_run", limit=10)
+        get_gcp_logs("other-service", service_type="cloud_run", limit=10)
+
+        mock_client_class.assert_called_once_with(project="test-project")
+
+
 class TestServiceTypeIntegration:
     """Integration tests for service type functionality (require mocking)."""
 
@@ -532,5 +575,17 @@ class TestBuildFilterVariations:
             assert '{project_id}' not in f
 
 
+
+class TestLookbackFilter:
+    """Tests for the lookback_filter helper function."""
+
+    @patch('src.tools.gcp_logging_tool.datetime')
+    def test_window_ends_now_and_spans_hours(self, mock_datetime):
+        """Test that the window is computed from the current time, to the second."""
+        mock_datetime.utcnow.return_value = datetime(2024, 1, 2, 12, 30, 15, 123456)
+
+        assert lookback_filter(24) == ' AND timestamp >= "2024-01-01T12:30:15Z" AND timestamp <= "2024-01-02T12:30:15Z"'
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
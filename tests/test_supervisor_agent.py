@@ -0,0 +1,158 @@
+"""Tests for the supervisor agent's prompt and response handling."""
+
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src.config import CONFIG
+from src.agents.supervisor import HISTORY_WINDOW_MESSAGES, _route_without_model, _routing_memo, supervisor_agent
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path):
+    """Point the LLM response cache at a temporary directory and start with no memoized routes."""
+    _routing_memo.clear()
+    with patch('src.agents._llm_cache.CACHE_DIR', str(tmp_path)):
+        yield
+    _routing_memo.clear()
+
+
+class TestSupervisorAgent:
+    """Tests for supervisor_agent."""
+
+    @patch('src.agents._llm_cache._model')
+    def test_fills_history_and_query_into_prompt(self, mock_model):
+        """Test that the history and a query containing braces reach the prompt verbatim."""
+        mock_model.return_value.generate_content.return_value.text = '```json\n{"next_agent": "log_explorer"}\n```'
+        history = [HumanMessage(content="hi"), AIMessage(content="hello")]
+
+        result = supervisor_agent("what does {foo} mean in that issue?", history)
+
+        prompt = mock_model.return_value.generate_content.call_args.args[0]
+        assert "User: hi\nAgent: hello" in prompt
+        assert prompt.rstrip().endswith("**User Query:** what does {foo} mean in that issue?\n**Response:**")
+        # The few-shot examples travel in the system instruction, not the per-call prompt
+        system_instruction = mock_model.call_args.args[1]
+        assert '{"next_agent": "solutions_agent"}' in system_instruction
+        assert "solutions_agent" not in prompt
+        assert result["next_agent"] == "log_explorer"
+
+    @patch('src.agents._llm_cache._model')
+    def test_routes_with_the_router_model(self, mock_model):
+        """Test that routing uses the router model with JSON output and a token cap."""
+        mock_model.return_value.generate_content.return_value.text = '{"next_agent": "log_explorer"}'
+
+        supervisor_agent("open an issue about that", [])
+
+        assert mock_model.call_args.args[0] == CONFIG.router_model
+        generation_config = mock_model.return_value.generate_content.call_args.kwargs["generation_config"]
+        assert generation_config["response_mime_type"] == "application/json"
+        assert generation_config["temperature"] == 0.0
+        assert generation_config["max_output_tokens"] > 0
+
+    @patch('src.agents._llm_cache._model')
+    def test_repeated_turn_reuses_routing_decision(self, mock_model):
+        """Test that an identical history and query are routed without a second model call."""
+        mock_model.return_value.generate_content.return_value.text = '{"next_agent": "solutions_agent"}'
+        history = [HumanMessage(content="hi")]
+
+        first = supervisor_agent("file an issue for it", history)
+        second = supervisor_agent("file an issue for it", history)
+
+        assert first["next_agent"] == second["next_agent"] == "solutions_agent"
+        assert mock_model.return_value.generate_content.call_count == 1
+
+    @patch('src.agents._llm_cache.load_cached', return_value=None)
+    @patch('src.agents._llm_cache._model')
+    def test_rephrased_whitespace_and_case_reuse_memoized_route(self, mock_model, mock_load_cached):
+        """Test that a query differing only in case and spacing is answered from memory."""
+        mock_model.return_value.generate_content.return_value.text = '{"next_agent": "github_issue_manager"}'
+        history = [HumanMessage(content="hi")]
+
+        first = supervisor_agent("File an issue for it", history)
+        second = supervisor_agent("  file an   ISSUE for it ", history)
+
+        assert first == second
+        assert mock_model.return_value.generate_content.call_count == 1
+        assert mock_load_cached.call_count == 1
+
+    @patch('src.agents._llm_cache._model')
+    def test_plain_text_response_is_used_as_agent_name(self, mock_model):
+        """Test that a response without a JSON object falls back to the raw text."""
+        mock_model.return_value.generate_content.return_value.text = "log_explorer\n"
+
+        result = supervisor_agent("open an issue for these logs", [])
+
+        assert result["next_agent"] == "log_explorer"
+        assert result["repo_url"] is None
+        assert result["issue_content"] is None
+
+    @patch('src.agents._llm_cache._model')
+    def test_agent_name_is_normalized(self, mock_model):
+        """Test that a route name in another case is mapped to the canonical agent name."""
+        mock_model.return_value.generate_content.return_value.text = '{"next_agent": " GitHub_Issue_Manager "}'
+
+        result = supervisor_agent("open an issue for that", [])
+
+        assert result["next_agent"] == "github_issue_manager"
+
+    @patch('src.agents._llm_cache._model')
+    def test_only_recent_history_reaches_prompt(self, mock_model):
+        """Test that messages older than the history window are left out."""
+        mock_model.return_value.generate_content.return_value.text = '{"next_agent": "log_explorer"}'
+        history = [HumanMessage(content=f"message {i}") for i in range(HISTORY_WINDOW_MESSAGES + 5)]
+
+        supervisor_agent("which repo was that?", history)
+
+        prompt = mock_model.return_value.generate_content.call_args.args[0]
+        assert "User: message 4\n" not in prompt
+        assert "User: message 5\n" in prompt
+        assert f"User: message {HISTORY_WINDOW_MESSAGES + 4}" in prompt
+
+
+class TestRouteWithoutModel:
+    """Tests for the deterministic routing prefilter."""
+
+    def test_plain_log_question_goes_to_log_explorer(self):
+        """Test that a log question without GitHub or solution terms skips the model."""
+        result = _route_without_model("for cloud run service vllm, show the logs since yesterday")
+
+        assert result["next_agent"] == "log_explorer"
+        assert result["repo_url"] is None
+
+    def test_log_request_with_repo_url_extracts_it(self):
+        """Test that log analysis naming a repository URL is routed with the URL."""
+        result = _route_without_model("Analyze the logs and create GitHub issues for problems in https://github.com/me/repo.git.")
+
+        assert result["next_agent"] == "log_explorer"
+        assert result["repo_url"] == "https://github.com/me/repo"
+
+    def test_solution_request_goes_to_solutions_agent(self):
+        """Test that a request for a solution is routed to the solutions agent."""
+        assert _route_without_model("I need a solution for the high latency")["next_agent"] == "solutions_agent"
+
+    def test_ambiguous_queries_use_the_model(self):
+        """Test that GitHub requests and references to earlier answers go to the model."""
+        assert _route_without_model("please create a github issue containing info for recommendation 6") is None
+        assert _route_without_model("create an issue in repository vllm-container-prewarm") is None
+        assert _route_without_model("https://github.com/me/repo please") is None
+
+    def test_unmatched_queries_use_the_model(self):
+        """Test that follow-ups and queries without an explicit pattern are left to the model."""
+        assert _route_without_model("for cloud run service vllm, did latency improve since yesterday?") is None
+        assert _route_without_model("why?") is None
+        assert _route_without_model("what about the second one") is None
+
+    def test_fixes_alone_do_not_mean_solutions(self):
+        """Test that asking to analyze logs and create fixes is not sent to the solutions agent."""
+        result = _route_without_model("analyze the logs and create fixes")
+
+        assert result["next_agent"] == "log_explorer"
+        assert _route_without_model("recommend a fix based on the logs") is None
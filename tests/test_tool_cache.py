@@ -0,0 +1,115 @@
+"""Tests for the TTL cache around the log and issue tools."""
+
+import os
+import sys
+import threading
+from unittest.mock import Mock, patch
+
+import pytest
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.tools.cache import ttl_cache
+
+
+class TestTtlCache:
+    """Tests for the ttl_cache decorator."""
+
+    def test_reuses_result_within_ttl(self):
+        """Test that a repeated call within the TTL is served from the cache."""
+        fetch = Mock(return_value="logs")
+        cached = ttl_cache(ttl=30)(fetch)
+
+        assert cached("svc", limit=10) == "logs"
+        assert cached("svc", limit=10) == "logs"
+        fetch.assert_called_once_with("svc", limit=10)
+
+    def test_different_arguments_are_cached_separately(self):
+        """Test that the key includes positional and keyword arguments."""
+        fetch = Mock(side_effect=lambda name, limit: f"{name}:{limit}")
+        cached = ttl_cache()(fetch)
+
+        assert cached("a", limit=1) == "a:1"
+        assert cached("a", limit=2) == "a:2"
+        assert fetch.call_count == 2
+
+    @patch('src.tools.cache.time.monotonic')
+    def test_expired_entries_are_refetched(self, mock_monotonic):
+        """Test that a call after the TTL hits the wrapped function again."""
+        fetch = Mock(return_value="logs")
+        cached = ttl_cache(ttl=30)(fetch)
+
+        mock_monotonic.return_value = 100.0
+        cached("svc")
+        mock_monotonic.return_value = 131.0
+        cached("svc")
+
+        assert fetch.call_count == 2
+
+    def test_uncacheable_results_are_not_stored(self):
+        """Test that results rejected by should_cache are refetched."""
+        fetch = Mock(return_value=("", None, ValueError("boom")))
+        cached = ttl_cache(should_cache=lambda result: result[2] is None)(fetch)
+
+        cached("svc")
+        cached("svc")
+
+        assert fetch.call_count == 2
+
+    def test_evicts_oldest_entry_beyond_maxsize(self):
+        """Test that the least recently stored entry is evicted first."""
+        fetch = Mock(side_effect=lambda name: name)
+        cached = ttl_cache(maxsize=2)(fetch)
+
+        cached("a")
+        cached("b")
+        cached("c")
+        cached("a")
+
+        assert fetch.call_count == 4
+
+    def test_concurrent_calls_share_one_fetch(self):
+        """Test that a call arriving while the same fetch is running waits for its result."""
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_fetch(name):
+            started.set()
+            release.wait(5)
+            return f"logs for {name}"
+
+        fetch = Mock(side_effect=slow_fetch)
+        cached = ttl_cache()(fetch)
+        results = []
+        first = threading.Thread(target=lambda: results.append(cached("svc")))
+        first.start()
+        started.wait(5)
+        second = threading.Thread(target=lambda: results.append(cached("svc")))
+        second.start()
+        release.set()
+        first.join(5)
+        second.join(5)
+
+        assert results == ["logs for svc", "logs for svc"]
+        fetch.assert_called_once_with("svc")
+
+    def test_failed_fetch_is_not_shared_afterwards(self):
+        """Test that an exception is raised to the caller and the next call retries."""
+        fetch = Mock(side_effect=[RuntimeError("boom"), "logs"])
+        cached = ttl_cache()(fetch)
+
+        with pytest.raises(RuntimeError):
+            cached("svc")
+        assert cached("svc") == "logs"
+
+    def test_cache_clear(self):
+        """Test that cache_clear forces the next call to refetch."""
+        fetch = Mock(return_value=["issue"])
+        cached = ttl_cache()(fetch)
+
+        cached("repo")
+        cached.cache_clear()
+        cached("repo")
+
+        assert fetch.call_count == 2
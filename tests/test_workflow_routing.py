@@ -0,0 +1,63 @@
+"""Tests for the supervisor node's short-circuits and the routing after it."""
+
+import os
+import sys
+from unittest.mock import patch
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from langchain_core.messages import HumanMessage
+from langgraph.graph import END
+
+from src.main import _USAGE_REPLY, route_after_supervisor, supervisor_node
+
+
+class TestSupervisorNode:
+    """Tests for supervisor_node."""
+
+    @patch('src.main.supervisor_agent')
+    def test_trivial_queries_skip_the_agents(self, mock_supervisor):
+        """Test that greetings and very short queries get the usage reply without a model call."""
+        for query in ["hi", "Thanks!", "ok", "  ?? "]:
+            result = supervisor_node({"messages": [HumanMessage(content=query)], "service_name": "svc"})
+
+            assert result == {"next_agent": "END", "orchestrator_history": [_USAGE_REPLY]}
+        mock_supervisor.assert_not_called()
+
+    @patch('src.main.supervisor_agent')
+    def test_short_follow_up_reaches_the_supervisor(self, mock_supervisor):
+        """Test that a short follow-up in an ongoing conversation is routed as usual."""
+        mock_supervisor.return_value = {"next_agent": "log_explorer", "history": ["Routing to log_explorer"]}
+        state = {
+            "messages": [HumanMessage(content="for cloud run service svc, any errors?"), HumanMessage(content="why?")],
+            "orchestrator_history": ["Routing to log_explorer", "Two errors at startup."],
+            "service_name": "svc",
+        }
+
+        result = supervisor_node(state)
+
+        mock_supervisor.assert_called_once()
+        assert result["next_agent"] == "log_explorer"
+
+    @patch('src.main.supervisor_agent')
+    def test_missing_service_name_ends_with_message(self, mock_supervisor):
+        """Test that a query without a service name ends the run with an explanation."""
+        result = supervisor_node({"messages": [HumanMessage(content="what errors happened today?")]})
+
+        assert result["next_agent"] == "END"
+        assert result["orchestrator_history"][0].startswith("No service name specified")
+        mock_supervisor.assert_not_called()
+
+
+class TestRouteAfterSupervisor:
+    """Tests for route_after_supervisor."""
+
+    def test_end_skips_the_agents(self):
+        """Test that a supervisor answer ends the run."""
+        assert route_after_supervisor({"next_agent": "END", "git_repo_url": "https://github.com/o/r"}) == [END]
+
+    def test_repo_url_fans_out(self):
+        """Test that a repo URL runs the log explorer and issue creation together."""
+        assert route_after_supervisor({"next_agent": "log_explorer", "git_repo_url": "https://github.com/o/r"}) == ["log_explorer", "issue_creation"]
+        assert route_after_supervisor({"next_agent": "log_explorer"}) == ["log_explorer"]